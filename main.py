@@ -3,20 +3,181 @@
 Main script for forensic metadata extraction from Google Drive
 """
 import argparse
+import json
+import logging
+import math
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
 
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from auth import authenticate, test_connection
-from extractor import MetadataExtractor
-from exporters import CSVExporter, JSONExporter, PDFExporter
-from web_viewer import WebViewer
-from helpers import extract_folder_id_from_url
+logger = logging.getLogger('sniffer')
 
+PDF_MAX_ROWS = 50000
+ARGS_ENV_VAR = 'METADATA_SNIFFER_ARGS_JSON'
+FORMAT_CHOICES = ('all', 'csv', 'json', 'pdf')
+BACKEND_CHOICES = ('thread', 'process')
+FLAG_OPTIONS = ('include_trashed', 'no_cache', 'refresh', 'no_batch', 'force_pdf')
+TRUE_STRINGS = ('true', '1', 'yes', 'on')
+FALSE_STRINGS = ('false', '0', 'no', 'off', '')
 
-def main():
-    """Main script function"""
+DEFAULT_ARGS = {
+    'output': 'forensic_metadata',
+    'folder_id': None,
+    'include_trashed': False,
+    'format': 'all',
+    'workers': None,
+    'backend': 'thread',
+    'max_qps': None,
+    'no_cache': False,
+    'refresh': False,
+    'no_batch': False,
+    'force_pdf': False,
+}
+
+
+def setup_logging():
+    """Sends status messages to stdout through the 'sniffer' logger"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+
+
+def _env_option_error(name: str, value, expected: str):
+    """Exits with a message naming the invalid option from METADATA_SNIFFER_ARGS_JSON"""
+    sys.exit(f"✗ Error: Invalid value for '{name}' in {ARGS_ENV_VAR}: {value!r} (expected {expected})")
+
+
+def _coerce_flag(name: str, value) -> bool:
+    """Converts a JSON flag value, including strings such as "false", to a bool"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in TRUE_STRINGS:
+            return True
+        if lowered in FALSE_STRINGS:
+            return False
+    _env_option_error(name, value, 'true or false')
+
+
+def _positive_number(value, kind):
+    """
+    Converts a number or numeric string to a positive, finite int or float.
+    
+    Args:
+        value: Command line string or JSON value
+        kind: int or float
+    
+    Returns:
+        The converted number
+    
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive, finite number of that kind
+    """
+    error = argparse.ArgumentTypeError(f"expected a positive {kind.__name__}, got {value!r}")
+    if isinstance(value, bool):
+        raise error
+    try:
+        number = kind(value.strip() if isinstance(value, str) else value)
+    except (TypeError, ValueError, OverflowError):
+        raise error from None
+    if kind is int and isinstance(value, float) and number != value:
+        raise error
+    if not math.isfinite(number) or number <= 0:
+        raise error
+    return number
+
+
+def positive_int(value) -> int:
+    """argparse type for options that take a positive integer"""
+    return _positive_number(value, int)
+
+
+def positive_float(value) -> float:
+    """argparse type for options that take a positive, finite number"""
+    return _positive_number(value, float)
+
+
+def _coerce_number(name: str, value, kind):
+    """Converts a JSON number or numeric string like the argument parser does, keeping None"""
+    if value is None:
+        return None
+    try:
+        return _positive_number(value, kind)
+    except argparse.ArgumentTypeError:
+        _env_option_error(name, value, f'a positive {kind.__name__}')
+
+
+def _validate_env_options(options: dict) -> dict:
+    """
+    Checks and converts options read from METADATA_SNIFFER_ARGS_JSON to the
+    types and choices the argument parser would produce.
+    
+    Args:
+        options: Options merged over DEFAULT_ARGS
+    
+    Returns:
+        dict: Options with converted values
+    """
+    for name, choices in (('format', FORMAT_CHOICES), ('backend', BACKEND_CHOICES)):
+        if options[name] not in choices:
+            _env_option_error(name, options[name], 'one of: ' + ', '.join(choices))
+    if not isinstance(options['output'], str) or not options['output']:
+        _env_option_error('output', options['output'], 'a non-empty string')
+    if options['folder_id'] is not None and not isinstance(options['folder_id'], str):
+        _env_option_error('folder_id', options['folder_id'], 'a string or null')
+    
+    options['workers'] = _coerce_number('workers', options['workers'], int)
+    options['max_qps'] = _coerce_number('max_qps', options['max_qps'], float)
+    for name in FLAG_OPTIONS:
+        options[name] = _coerce_flag(name, options[name])
+    return options
+
+
+def load_args_from_env(argv=None):
+    """
+    Reads CLI options from the METADATA_SNIFFER_ARGS_JSON environment variable,
+    so scheduled runs with fixed options skip building the argument parser.
+    Values are validated and converted like the command line options.
+    Command line arguments are refused while the variable is set, since
+    they would otherwise be ignored.
+    
+    Args:
+        argv: Command line arguments (default: sys.argv[1:])
+    
+    Returns:
+        SimpleNamespace with the options, or None if the variable is not set
+    """
+    raw = os.environ.get(ARGS_ENV_VAR)
+    if not raw:
+        return None
+    
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        sys.exit(f"✗ Error: {ARGS_ENV_VAR} is set, so command line arguments would be ignored: "
+                 f"{' '.join(argv)}. Pass the options in one place only.")
+    
+    try:
+        options = json.loads(raw)
+    except ValueError as e:
+        sys.exit(f"✗ Error: {ARGS_ENV_VAR} is not valid JSON: {e}")
+    if not isinstance(options, dict):
+        sys.exit(f"✗ Error: {ARGS_ENV_VAR} must be a JSON object")
+    
+    options = {key.replace('-', '_'): value for key, value in options.items()}
+    unknown = sorted(set(options) - set(DEFAULT_ARGS))
+    if unknown:
+        sys.exit(f"✗ Error: Unknown option(s) in {ARGS_ENV_VAR}: {', '.join(unknown)}")
+    
+    return SimpleNamespace(**_validate_env_options({**DEFAULT_ARGS, **options}))
+
+
+def parse_args():
+    """Parses the command line options"""
     parser = argparse.ArgumentParser(
         description='Forensic Metadata Extractor for Google Drive',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -33,14 +194,14 @@ Usage examples:
     parser.add_argument(
         '--output', '-o',
         type=str,
-        default='forensic_metadata',
+        default=DEFAULT_ARGS['output'],
         help='Base name for output files (without extension)'
     )
     
     parser.add_argument(
         '--folder-id', '-f',
         type=str,
-        default=None,
+        default=DEFAULT_ARGS['folder_id'],
         help='ID of specific folder or shared link to scan (optional, defaults to entire Drive). Can be a folder ID or a Google Drive shared link URL.'
     )
     
@@ -53,138 +214,218 @@ Usage examples:
     parser.add_argument(
         '--format',
         type=str,
-        choices=['all', 'csv', 'json', 'pdf'],
-        default='all',
+        choices=FORMAT_CHOICES,
+        default=DEFAULT_ARGS['format'],
         help='Output format (default: all)'
     )
     
     parser.add_argument(
         '--workers', '-w',
-        type=int,
-        default=None,
-        help='Number of parallel workers (default: CPU count * 2, max 32)'
+        type=positive_int,
+        default=DEFAULT_ARGS['workers'],
+        help='Number of worker processes for --backend process (default: CPU count); '
+             'the thread backend processes files sequentially and ignores it unless --no-batch is set'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--backend',
+        type=str,
+        choices=BACKEND_CHOICES,
+        default=DEFAULT_ARGS['backend'],
+        help='Process files in the main thread or in a pool of worker processes (default: thread)'
+    )
+    
+    parser.add_argument(
+        '--max-qps',
+        type=positive_float,
+        default=DEFAULT_ARGS['max_qps'],
+        help='Maximum Drive API requests per second (default: unlimited; batched calls are paced at 10 per second)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not reuse or store folder listings between runs'
+    )
+    
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Discard the cached folder listing and rescan from scratch'
+    )
+    
+    parser.add_argument(
+        '--no-batch',
+        action='store_true',
+        help='Send one HTTP request per API call instead of batching them'
+    )
     
-    print("="*60)
-    print("METADATA SNIFFER - Forensic Extractor for Google Drive")
-    print("="*60)
-    print()
+    parser.add_argument(
+        '--force-pdf',
+        action='store_true',
+        help=f'Generate the PDF report even for more than {PDF_MAX_ROWS} files'
+    )
+    
+    return parser.parse_args()
+
+
+def main():
+    """Main script function"""
+    args = load_args_from_env() or parse_args()
+    setup_logging()
+    
+    from auth import authenticate, test_connection, prewarm_connections, get_account_id
+    from extractor import MetadataExtractor
+    from helpers import extract_folder_id_from_url
+    from cache import ListingCache
+    
+    prewarm_connections()
+    
+    logger.info("="*60)
+    logger.info("METADATA SNIFFER - Forensic Extractor for Google Drive")
+    logger.info("="*60)
+    logger.info("")
     
     try:
-        print("🔐 Authenticating with Google Drive...")
+        logger.info("🔐 Authenticating with Google Drive...")
         service = authenticate()
         
         if not test_connection(service):
-            print("✗ Error: Could not establish connection with Google Drive")
+            logger.error("✗ Error: Could not establish connection with Google Drive")
             sys.exit(1)
         
-        print()
+        logger.info("")
         
         folder_id = None
         if args.folder_id:
             folder_id = extract_folder_id_from_url(args.folder_id)
             if not folder_id:
-                print(f"✗ Error: Invalid folder ID or shared link format: {args.folder_id}")
-                print("   Please provide a valid Google Drive folder ID or shared link.")
+                logger.error("✗ Error: Invalid folder ID or shared link format: %s", args.folder_id)
+                logger.info("   Please provide a valid Google Drive folder ID or shared link.")
                 sys.exit(1)
             if folder_id != args.folder_id:
-                print(f"ℹ Extracted folder ID from shared link: {folder_id[:20]}...")
+                logger.info("ℹ Extracted folder ID from shared link: %s...", folder_id[:20])
         
-        extractor = MetadataExtractor(service, max_workers=args.workers)
+        cache = None
+        if not args.no_cache:
+            cache = ListingCache.for_scope(folder_id, args.include_trashed, get_account_id(service))
+            if args.refresh:
+                cache.clear()
         
-        metadata = extractor.extract_folder(
-            folder_id=folder_id,
-            include_trashed=args.include_trashed
+        extractor = MetadataExtractor(
+            service,
+            max_workers=args.workers,
+            use_batch=not args.no_batch,
+            backend=args.backend,
+            cache=cache,
+            max_qps=args.max_qps
         )
         
+        try:
+            metadata = extractor.extract_folder(
+                folder_id=folder_id,
+                include_trashed=args.include_trashed
+            )
+        finally:
+            if cache:
+                cache.close()
+        
         if not metadata:
-            print("⚠ No files found to extract")
+            logger.warning("⚠ No files found to extract")
             sys.exit(0)
         
         output_formats = []
         if args.format == 'all':
             output_formats = ['csv', 'json', 'pdf']
+            if len(metadata) > PDF_MAX_ROWS and not args.force_pdf:
+                logger.warning("⚠ Skipping PDF report (%d files, limit %d). Use --force-pdf to generate it.",
+                               len(metadata), PDF_MAX_ROWS)
+                output_formats.remove('pdf')
         else:
             output_formats = [args.format]
         
-        print("\n" + "="*60)
-        print("Exporting results...")
-        print("="*60 + "\n")
+        logger.info("\n" + "="*60)
+        logger.info("Exporting results...")
+        logger.info("="*60 + "\n")
         
+        exporter_classes = {}
         if 'csv' in output_formats:
-            csv_exporter = CSVExporter(args.output)
-            csv_exporter.export(metadata)
-        
+            from exporters import CSVExporter
+            exporter_classes['csv'] = CSVExporter
         if 'json' in output_formats:
-            json_exporter = JSONExporter(args.output)
-            json_exporter.export(metadata)
-        
+            from exporters import JSONExporter
+            exporter_classes['json'] = JSONExporter
         if 'pdf' in output_formats:
-            pdf_exporter = PDFExporter(args.output)
-            pdf_exporter.export(metadata)
+            from exporters import PDFExporter
+            exporter_classes['pdf'] = PDFExporter
+        
+        from exporters import ForensicDigest
+        digest = ForensicDigest(metadata)
         
-        print("\n" + "="*60)
-        print("✓ Process completed successfully")
-        print("="*60)
-        print(f"\nGenerated files:")
+        exporters = {fmt: exporter_classes[fmt](args.output) for fmt in output_formats}
+        with ThreadPoolExecutor(max_workers=len(exporters)) as executor:
+            futures = [executor.submit(exporter.export, metadata, digest) for exporter in exporters.values()]
+            for future in futures:
+                future.result()
+        
+        logger.info("\n" + "="*60)
+        logger.info("✓ Process completed successfully")
+        logger.info("="*60)
+        logger.info("\nGenerated files:")
         for fmt in output_formats:
             ext = fmt if fmt != 'json' else 'json'
-            print(f"  - {args.output}.{ext}")
-        print()
+            logger.info("  - %s.%s", args.output, ext)
+        logger.info("")
         
-        print("="*60)
-        print("🌐 Launching web viewer...")
-        print("="*60)
-        print("\nThe web viewer will open in your browser automatically.")
-        print("You can filter, sort, and explore all extracted metadata.")
-        print("Press Ctrl+C in the terminal to stop the web server.\n")
+        logger.info("="*60)
+        logger.info("🌐 Launching web viewer...")
+        logger.info("="*60)
+        logger.info("\nThe web viewer will open in your browser automatically.")
+        logger.info("You can filter, sort, and explore all extracted metadata.")
+        logger.info("Press Ctrl+C in the terminal to stop the web server.\n")
         
         try:
-            viewer = WebViewer(metadata, args.output)
+            from web_viewer import WebViewer
+            if 'json' in exporters:
+                viewer = WebViewer.from_file(exporters['json'].output_path)
+            else:
+                viewer = WebViewer(metadata, args.output)
             viewer.start_server(open_browser=True)
         except Exception as e:
-            print(f"⚠ Could not launch web viewer: {e}")
-            print("You can still view the exported CSV, JSON, and PDF files.")
+            logger.warning("⚠ Could not launch web viewer: %s", e)
+            logger.info("You can still view the exported CSV, JSON, and PDF files.")
         
     except FileNotFoundError as e:
-        print(f"\n✗ Error: {e}")
-        print("\nPlease make sure you have the 'credentials.json' file")
-        print("downloaded from Google Cloud Console.")
+        logger.error("\n✗ Error: %s", e)
+        logger.info("\nPlease make sure you have the 'credentials.json' file")
+        logger.info("downloaded from Google Cloud Console.")
         sys.exit(1)
     
     except KeyboardInterrupt:
-        print("\n\n⚠ Process interrupted by user")
+        logger.warning("\n\n⚠ Process interrupted by user")
         sys.exit(1)
     
     except Exception as e:
-        print(f"\n✗ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("\n✗ Unexpected error: %s", e)
         sys.exit(1)
 
 
 if __name__ == '__main__':
     import sys
     
-    if len(sys.argv) == 1:
-        print("="*60)
-        print("🌐 Launching Web Application...")
-        print("="*60)
-        print("\nStarting web server. The browser will open automatically.")
-        print("Use --help to see CLI options.\n")
-        
-        from web_app import app
-        import webbrowser
-        import threading
-        import time
+    if len(sys.argv) == 1 and not os.environ.get(ARGS_ENV_VAR):
+        setup_logging()
+        logger.info("="*60)
+        logger.info("🌐 Launching Web Application...")
+        logger.info("="*60)
+        logger.info("\nStarting web server. The browser will open automatically.")
+        logger.info("Use --help to see CLI options.\n")
         
-        def open_browser():
-            time.sleep(1.5)
-            webbrowser.open('http://localhost:5000')
+        from web_app import app, SERVER_THREADS
+        from web_viewer import serve
+        from auth import prewarm_connections
         
-        threading.Thread(target=open_browser, daemon=True).start()
-        app.run(host='127.0.0.1', port=5000, debug=False, use_reloader=False)
+        prewarm_connections()
+        serve(app, 5000, threads=SERVER_THREADS)
     else:
         main()
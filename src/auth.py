@@ -2,14 +2,164 @@
 Authentication module with Google Drive API using OAuth2
 """
 import os
+import sys
+import json
 import stat
+import logging
+import tempfile
+import socket
+import threading
+from datetime import datetime
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from google_auth_httplib2 import AuthorizedHttp
+
+from transport import Http2Transport, ThreadLocalHttp, HTTP2_AVAILABLE
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
+REFRESH_AT_TTL_FRACTION = 0.9
+HEADLESS_OAUTH_PORT = 8080
+WARMUP_HOSTS = ('www.googleapis.com', 'oauth2.googleapis.com')
+
+_refresh_timer = None
+logger = logging.getLogger('sniffer.auth')
+_transport = None
+
+
+def prewarm_connections():
+    """
+    Resolves the Google API hosts and opens the HTTP/2 connection in a
+    background thread, so DNS lookup and the TLS handshake overlap with
+    authentication instead of delaying the first API call. Failures are
+    ignored; the real requests will report any network error.
+    """
+    global _transport
+    
+    if HTTP2_AVAILABLE and _transport is None:
+        _transport = Http2Transport()
+    transport = _transport
+    
+    def warm_up():
+        for host in WARMUP_HOSTS:
+            try:
+                socket.getaddrinfo(host, 443, proto=socket.IPPROTO_TCP)
+            except OSError:
+                pass
+        if transport is not None:
+            try:
+                transport.client.head(f'https://{WARMUP_HOSTS[0]}/')
+            except Exception:
+                pass
+    
+    threading.Thread(target=warm_up, daemon=True).start()
+
+
+def build_service(creds):
+    """
+    Builds the Google Drive service for the given credentials.
+    Uses a pooled HTTP/2 transport when httpx is installed, falling back
+    to httplib2 (HTTP/1.1) with one connection per thread otherwise, so
+    parallel workers never share a non-thread-safe httplib2.Http. Responses
+    are gzip-compressed in both cases. The connection opened by
+    prewarm_connections() is reused if there is one.
+    
+    Args:
+        creds: Valid OAuth2 credentials
+    
+    Returns:
+        googleapiclient.discovery.Resource: Google Drive service
+    """
+    if HTTP2_AVAILABLE:
+        return build('drive', 'v3', http=AuthorizedHttp(creds, http=_transport or Http2Transport()))
+    return build('drive', 'v3', http=AuthorizedHttp(creds, http=ThreadLocalHttp()))
+
+
+def is_headless() -> bool:
+    """
+    Detects whether the OAuth flow cannot open a local browser.
+    
+    Returns:
+        bool: True if METADATA_SNIFFER_HEADLESS is set, or on Linux without a display
+    """
+    if os.environ.get('METADATA_SNIFFER_HEADLESS'):
+        return True
+    return (sys.platform.startswith('linux')
+            and not os.environ.get('DISPLAY')
+            and not os.environ.get('WAYLAND_DISPLAY'))
+
+
+def save_token(creds, token_file: str):
+    """
+    Writes credentials to token_file through a temporary file that replaces
+    it atomically, so a concurrent authenticate() never reads a partial file.
+    
+    Args:
+        creds: OAuth2 credentials to save
+        token_file: Path of the token file
+    
+    Raises:
+        OSError: If the token file cannot be written
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(token_file)),
+                                     prefix='.token-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as token:
+            token.write(creds.to_json())
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, token_file)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def schedule_token_refresh(creds, token_file=None):
+    """
+    Refreshes the access token in the background before it expires, so
+    API calls never block on a token refresh. Only one refresh timer is
+    kept alive; scheduling a new one cancels the previous timer.
+    
+    Args:
+        creds: OAuth2 credentials to keep fresh
+        token_file: Optional path where refreshed credentials are saved
+    """
+    global _refresh_timer
+    
+    if _refresh_timer is not None:
+        _refresh_timer.cancel()
+        _refresh_timer = None
+    
+    if not creds.expiry or not creds.refresh_token:
+        return
+    
+    ttl = (creds.expiry - datetime.utcnow()).total_seconds()
+    
+    def refresh():
+        try:
+            creds.refresh(Request())
+        except Exception as e:
+            logger.warning("⚠ Warning: Background token refresh failed: %s", e)
+            return
+        if token_file:
+            try:
+                save_token(creds, token_file)
+            except OSError as e:
+                logger.warning("⚠ Warning: Could not save refreshed token to %s: %s", token_file, e)
+        schedule_token_refresh(creds, token_file)
+    
+    _refresh_timer = threading.Timer(max(0, ttl * REFRESH_AT_TTL_FRACTION), refresh)
+    _refresh_timer.daemon = True
+    _refresh_timer.start()
 
 
 def authenticate():
@@ -34,22 +184,24 @@ def authenticate():
             "Please download OAuth2 credentials from Google Cloud Console."
         )
     
-    if os.path.exists(token_file):
-        try:
-            if os.access(token_file, os.R_OK):
-                try:
-                    creds = Credentials.from_authorized_user_file(token_file, SCOPES)
-                except Exception as e:
-                    print(f"⚠ Warning: Could not load credentials from {token_file}: {e}")
-                    creds = None
-            else:
-                print(f"⚠ Warning: {token_file} exists but is not readable (permission denied).")
-                print(f"   The file is owned by root. Will request new authorization.")
-                print(f"   To fix permanently, run: sudo chown $USER:$USER {token_file}")
-                creds = None
-        except (OSError, PermissionError) as e:
-            print(f"⚠ Warning: Could not read {token_file}: {e}. Will request new authorization.")
-            creds = None
+    try:
+        with open(token_file, 'rb') as token:
+            token_data = token.read()
+        token_info = orjson.loads(token_data) if orjson is not None else json.loads(token_data)
+        creds = Credentials.from_authorized_user_info(token_info, SCOPES)
+    except FileNotFoundError:
+        creds = None
+    except PermissionError:
+        print(f"⚠ Warning: {token_file} exists but is not readable (permission denied).")
+        print(f"   The file is owned by root. Will request new authorization.")
+        print(f"   To fix permanently, run: sudo chown $USER:$USER {token_file}")
+        creds = None
+    except OSError as e:
+        print(f"⚠ Warning: Could not read {token_file}: {e}. Will request new authorization.")
+        creds = None
+    except Exception as e:
+        print(f"⚠ Warning: Could not load credentials from {token_file}: {e}")
+        creds = None
     
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
@@ -62,7 +214,11 @@ def authenticate():
         if not creds or not creds.valid:
             flow = InstalledAppFlow.from_client_secrets_file(
                 credentials_file, SCOPES)
-            creds = flow.run_local_server(port=0)
+            if is_headless():
+                port = int(os.environ.get('METADATA_SNIFFER_OAUTH_PORT', HEADLESS_OAUTH_PORT))
+                creds = flow.run_local_server(port=port, open_browser=False)
+            else:
+                creds = flow.run_local_server(port=0)
         
         try:
             if os.path.exists(token_file) and not os.access(token_file, os.W_OK):
@@ -80,20 +236,15 @@ def authenticate():
                             os.replace(temp_token_file, token_file)
                         except:
                             print(f"⚠ Created {temp_token_file} instead. Please remove old {token_file}")
-                            return build('drive', 'v3', credentials=creds)
+                            schedule_token_refresh(creds)
+                            return build_service(creds)
                     except Exception as e2:
                         raise PermissionError(
                             f"Cannot write token file. Error: {e2}. "
                             f"Please run: sudo chown $USER:$USER {token_file} or remove it manually."
                         )
             
-            with open(token_file, 'w') as token:
-                token.write(creds.to_json())
-            
-            try:
-                os.chmod(token_file, 0o644)
-            except:
-                pass
+            save_token(creds, token_file)
                 
         except (OSError, PermissionError) as e:
             raise PermissionError(
@@ -102,13 +253,30 @@ def authenticate():
                 f"To fix, run: sudo chown $USER:$USER {token_file} && sudo chmod 644 {token_file}"
             )
     
+    schedule_token_refresh(creds, token_file)
+    
     try:
-        service = build('drive', 'v3', credentials=creds)
+        service = build_service(creds)
         return service
     except HttpError as error:
         raise Exception(f"Error building Google Drive service: {error}")
 
 
+def get_account_id(service) -> str:
+    """
+    Returns the permission ID of the authenticated user, which stays the
+    same when the account's email address changes.
+    
+    Args:
+        service: Authenticated Google Drive service
+    
+    Returns:
+        str: Permission ID of the user
+    """
+    about = service.about().get(fields='user/permissionId').execute()
+    return about['user']['permissionId']
+
+
 def test_connection(service):
     """
     Tests the connection with Google Drive.
@@ -120,7 +288,7 @@ def test_connection(service):
         bool: True if connection is successful
     """
     try:
-        about = service.about().get(fields='user').execute()
+        about = service.about().get(fields='user/emailAddress').execute()
         print(f"✓ Connected as: {about['user']['emailAddress']}")
         return True
     except HttpError as error:
@@ -0,0 +1,134 @@
+"""
+Persistent on-disk cache of Google Drive folder listings
+"""
+import json
+import sqlite3
+from pathlib import Path
+from typing import List, Dict, Optional, Set
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'metadata-sniffer'
+
+
+class ListingCache:
+    """SQLite-backed cache of files.list results for one scan scope"""
+    
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'CREATE TABLE IF NOT EXISTS files (id TEXT PRIMARY KEY, data TEXT NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS folders (id TEXT PRIMARY KEY);'
+            'CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);'
+        )
+        self.conn.commit()
+    
+    @classmethod
+    def for_scope(cls, folder_id: Optional[str], include_trashed: bool, account_id: str,
+                  cache_dir: Path = DEFAULT_CACHE_DIR) -> 'ListingCache':
+        """
+        Opens the cache for a scan scope (folder or entire Drive) of one
+        account. Each account gets its own directory, since the same scope
+        lists different files for different users.
+        
+        Args:
+            folder_id: ID of the scanned folder (None for entire Drive)
+            include_trashed: Whether the scan includes trashed files
+            account_id: Permission ID of the authenticated user
+            cache_dir: Directory holding the cache databases
+        
+        Returns:
+            ListingCache instance
+        
+        Raises:
+            ValueError: If account_id is empty or not a plain identifier
+        """
+        if not account_id or not account_id.isalnum():
+            raise ValueError(f"Invalid account ID for the listing cache: {account_id!r}")
+        
+        name = folder_id or 'drive'
+        if include_trashed:
+            name += '-trashed'
+        return cls(Path(cache_dir) / account_id / f'{name}.sqlite')
+    
+    def get_start_page_token(self) -> Optional[str]:
+        """Returns the Changes API token the cached listing is valid for"""
+        row = self.conn.execute(
+            "SELECT value FROM state WHERE key = 'start_page_token'"
+        ).fetchone()
+        return row[0] if row else None
+    
+    def load_files(self) -> List[Dict]:
+        """Returns all cached file dictionaries in createdTime order, like files.list"""
+        return [json.loads(data) for (data,) in self.conn.execute(
+            "SELECT data FROM files ORDER BY json_extract(data, '$.createdTime'), id"
+        )]
+    
+    def load_folders(self) -> Set[str]:
+        """Returns the IDs of all cached folders in the scanned subtree"""
+        return {folder_id for (folder_id,) in self.conn.execute('SELECT id FROM folders')}
+    
+    def replace(self, files: List[Dict], folders: Set[str], start_page_token: str):
+        """
+        Replaces the cached listing with the result of a full scan.
+        
+        Args:
+            files: File dictionaries returned by files.list
+            folders: IDs of the folders in the scanned subtree
+            start_page_token: Changes API token taken before the scan started
+        """
+        with self.conn:
+            self.conn.execute('DELETE FROM files')
+            self.conn.execute('DELETE FROM folders')
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO files (id, data) VALUES (?, ?)',
+                ((file['id'], json.dumps(file)) for file in files if file.get('id'))
+            )
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO folders (id) VALUES (?)',
+                ((folder_id,) for folder_id in folders)
+            )
+            self._set_start_page_token(start_page_token)
+    
+    def apply_changes(self, upserts: List[Dict], removals: List[str], start_page_token: str):
+        """
+        Applies a set of Changes API deltas to the cached listing.
+        
+        Args:
+            upserts: New or modified file dictionaries
+            removals: IDs of files that left the scan scope
+            start_page_token: New Changes API token
+        """
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO files (id, data) VALUES (?, ?)',
+                ((file['id'], json.dumps(file)) for file in upserts)
+            )
+            self.conn.executemany(
+                'DELETE FROM files WHERE id = ?',
+                ((file_id,) for file_id in removals)
+            )
+            self._set_start_page_token(start_page_token)
+    
+    def clear(self):
+        """Removes all cached data"""
+        with self.conn:
+            self.conn.execute('DELETE FROM files')
+            self.conn.execute('DELETE FROM folders')
+            self.conn.execute('DELETE FROM state')
+    
+    def close(self):
+        """Closes the underlying database connection"""
+        self.conn.close()
+    
+    def _set_start_page_token(self, start_page_token: str):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO state (key, value) VALUES ('start_page_token', ?)",
+            (start_page_token,)
+        )
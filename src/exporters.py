@@ -4,8 +4,11 @@ Export modules for different forensic formats
 import json
 import csv
 import hashlib
+from collections import Counter
+from functools import lru_cache, partial
 from datetime import datetime
-from typing import List, Dict
+from xml.sax.saxutils import escape
+from typing import List, Dict, Optional
 from pathlib import Path
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
@@ -14,8 +17,104 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.units import mm
 from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas as pdfcanvas
 from reportlab.pdfbase.ttfonts import TTFont
 
+from io_backend import open_text, open_binary
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+HASH_CHUNK_SIZE = 256 * 1024
+
+# Fields covered by the forensic hash, in the (sorted) order they are serialized
+FORENSIC_FIELDS = (
+    'creation_date_raw',
+    'description',
+    'file_type',
+    'id',
+    'md5_checksum',
+    'mime_type',
+    'modification_date_raw',
+    'name',
+    'size_bytes',
+    'trashed'
+)
+
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Forensic hash of an empty file list (canonical JSON of {'files': []})
+EMPTY_FORENSIC_HASH = hashlib.sha256(b'{"files":[]}').hexdigest()
+
+
+def _canonical_list(value: list) -> str:
+    """Joins the non-empty items of a list field, stripped and sorted, with ';'"""
+    if not value:
+        return ''
+    items = [str(v).strip() for v in value if v]
+    items.sort()
+    return ';'.join(items)
+
+
+# Normalizers for the exact built-in types found in Drive metadata; subclasses
+# and other types go through the isinstance() checks in normalize_forensic_value
+_FORENSIC_NORMALIZERS = {
+    type(None): lambda value: '',
+    bool: lambda value: 'true' if value else 'false',
+    int: str,
+    float: lambda value: str(int(value)) if value.is_integer() else str(value),
+    str: str.strip,
+    list: _canonical_list,
+}
+
+# Table styles shared by every PDF report (TableStyle is never mutated by Table)
+INFO_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.grey),
+    ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('BACKGROUND', (1, 0), (1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+STATS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
+    ('BACKGROUND', (1, 1), (1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+FILE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (0, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('FONTSIZE', (1, 1), (1, 1), 7),
+    ('FONTSIZE', (1, 8), (1, 9), 7),
+    ('FONTSIZE', (1, -1), (1, -1), 7),
+    ('VALIGN', (1, -1), (1, -1), 'TOP'),
+    ('LEFTPADDING', (1, -1), (1, -1), 4),
+    ('RIGHTPADDING', (1, -1), (1, -1), 4),
+])
+
+# Widest text drawn as a plain string in the value column of FILE_TABLE_STYLE
+VALUE_CELL_WIDTH = 4 * inch - 12
+
 
 def calculate_file_hash(file_path: Path) -> str:
     """
@@ -27,14 +126,56 @@ def calculate_file_hash(file_path: Path) -> str:
     Returns:
         SHA-256 hash as hexadecimal string
     """
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        
+        sha256_hash = hashlib.sha256()
+        buffer = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            sha256_hash.update(view[:read])
     return sha256_hash.hexdigest()
 
 
-def create_forensic_hash_data(metadata: List[Dict]) -> Dict:
+def normalize_forensic_value(value):
+    """
+    Converts a metadata value to its canonical string form for hashing.
+    
+    Args:
+        value: Raw metadata value
+    
+    Returns:
+        Normalized value (strings are stripped, lists joined with ';')
+    """
+    normalize = _FORENSIC_NORMALIZERS.get(type(value))
+    if normalize is not None:
+        return normalize(value)
+    
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+    if isinstance(value, list):
+        return _canonical_list(value)
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def sort_by_id(metadata: List[Dict]) -> List[Dict]:
+    """Returns metadata ordered by file ID, the canonical order of all exports"""
+    return sorted(metadata, key=lambda x: x.get('id', ''))
+
+
+def create_forensic_hash_data(metadata: List[Dict], presorted: bool = False) -> Dict:
     """
     Create a deterministic forensic data structure for hashing.
     
@@ -59,56 +200,183 @@ def create_forensic_hash_data(metadata: List[Dict]) -> Dict:
     
     Args:
         metadata: List of file metadata dictionaries (ALL files in Drive/folder)
+        presorted: True if metadata is already ordered by sort_by_id()
     
     Returns:
         Dictionary with forensic fields for all files, sorted for determinism
     """
+
+    if not metadata:
+        return {'files': []}
     
-    forensic_fields = [
-        'id',
-        'name',
-        'mime_type',
-        'file_type',
-        'creation_date_raw',
-        'modification_date_raw',
-        'size_bytes',
-        'md5_checksum',
-        'description',
-        'trashed'
-    ]
-    
-    sorted_metadata = sorted(metadata, key=lambda x: x.get('id', ''))
+    sorted_metadata = metadata if presorted else sort_by_id(metadata)
     
+    # Hot loop: normalizers are looked up by exact type through local names,
+    # falling back to normalize_forensic_value() for anything unusual
+    get_normalizer = _FORENSIC_NORMALIZERS.get
+    fallback = normalize_forensic_value
     forensic_files = []
     for file_data in sorted_metadata:
+        get = file_data.get
         forensic_file = {}
-        for field in sorted(forensic_fields):
-            value = file_data.get(field, '')
-            
-            if value is None:
-                value = ''
-            elif isinstance(value, bool):
-                value = 'true' if value else 'false'
-            elif isinstance(value, (int, float)):
-                if isinstance(value, float) and value.is_integer():
-                    value = str(int(value))
-                else:
-                    value = str(value)
-            elif isinstance(value, list):
-                value = ';'.join(sorted(str(v).strip() for v in value if v)) if value else ''
-            elif isinstance(value, str):
-                value = value.strip() if value else ''
-                if not value:
-                    value = ''
-            
-            forensic_file[field] = value
-        
-        forensic_file = {k: forensic_file[k] for k in sorted(forensic_file.keys())}
+        for field in FORENSIC_FIELDS:
+            value = get(field, '')
+            forensic_file[field] = get_normalizer(type(value), fallback)(value)
         forensic_files.append(forensic_file)
     
     return {'files': forensic_files}
 
 
+class ForensicDigest:
+    """
+    Forensic hash of a metadata set, computed once and shared by all exporters
+    of the same extraction.
+    """
+    
+    def __init__(self, metadata: List[Dict]):
+        """
+        Args:
+            metadata: List of file metadata dictionaries
+        """
+        self.sorted_metadata = sort_by_id(metadata)
+        if metadata:
+            # The forensic data is only needed for hashing; it is not kept on
+            # the digest so exporters never hold a second copy of every record
+            data = create_forensic_hash_data(self.sorted_metadata, presorted=True)
+            self.hash = hashlib.sha256(self._serialized(data)).hexdigest()
+        else:
+            self.hash = EMPTY_FORENSIC_HASH
+    
+    @staticmethod
+    def _serialized(data: Dict) -> bytes:
+        """
+        Returns the canonical UTF-8 JSON encoding of the forensic data.
+        
+        orjson produces the same bytes as the compact, sorted, non-ASCII-escaping
+        json.dumps call below as long as every value is a string, which is what
+        the normalizers produce for all regular Drive metadata. Anything else
+        (e.g. floats or nested objects from unusual values) keeps using the
+        stdlib encoder so the hash never changes.
+        
+        Args:
+            data: Forensic data built by create_forensic_hash_data()
+        """
+        files = data['files']
+        if orjson is not None and all(type(value) is str for file in files for value in file.values()):
+            try:
+                return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+            except orjson.JSONEncodeError:
+                pass
+        return json.dumps(
+            data, indent=None, separators=(',', ':'), ensure_ascii=False, sort_keys=True
+        ).encode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def get_forensic_styles():
+    """
+    Builds the PDF report stylesheet once; it is shared read-only by every
+    PDFExporter.
+    
+    Returns:
+        reportlab StyleSheet1 with the Forensic* paragraph styles added
+    """
+    styles = getSampleStyleSheet()
+    
+    def add_style_safe(name, **kwargs):
+        if name not in styles.byName:
+            try:
+                styles.add(ParagraphStyle(name=name, **kwargs))
+            except Exception:
+                pass
+        if name in styles.byName:
+            style = styles.byName[name]
+            for key, value in kwargs.items():
+                if hasattr(style, key):
+                    setattr(style, key, value)
+    
+    add_style_safe('ForensicTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=12,
+        alignment=1
+    )
+    
+    add_style_safe('ForensicHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=8
+    )
+    
+    add_style_safe('ForensicText',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6
+    )
+    
+    add_style_safe('ForensicURL',
+        parent=styles['Normal'],
+        fontSize=7,
+        spaceAfter=4,
+        wordWrap='LTR',
+        leading=8
+    )
+    
+    add_style_safe('ForensicFooter',
+        parent=styles['Normal'],
+        fontSize=9,
+        spaceAfter=0,
+        alignment=1,
+        textColor=colors.HexColor('#666666')
+    )
+    
+    return styles
+
+
+class NumberedCanvas(pdfcanvas.Canvas):
+    """
+    Canvas that stamps the forensic hash and "page/total" footer on every page.
+    
+    Finished pages are held back until save(), when the total page count is
+    known, so the document only has to be laid out once.
+    """
+    
+    def __init__(self, *args, forensic_hash: str = '', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.forensic_hash = forensic_hash
+        self._saved_page_states = []
+    
+    def showPage(self):
+        self._saved_page_states.append(dict(self.__dict__))
+        self._startPage()
+    
+    def save(self):
+        total_pages = len(self._saved_page_states)
+        for state in self._saved_page_states:
+            self.__dict__.update(state)
+            self._draw_footer(total_pages)
+            super().showPage()
+        super().save()
+    
+    def _draw_footer(self, total_pages: int):
+        """
+        Draws the footer with the forensic hash and page number.
+        
+        Args:
+            total_pages: Number of pages in the document
+        """
+        self.saveState()
+        page_width = self._pagesize[0]
+        footer_y = 8 * mm
+        self.setFillColor(colors.HexColor('#666666'))
+        self.setFont("Helvetica", 7)
+        self.drawCentredString(page_width / 2.0, footer_y + 10, f"SHA-256: {self.forensic_hash}")
+        self.drawCentredString(page_width / 2.0, footer_y, f"{self.getPageNumber()}/{total_pages}")
+        self.restoreState()
+
+
 class CSVExporter:
     """CSV format exporter"""
     
@@ -122,12 +390,13 @@ class CSVExporter:
         
         self.output_path = output_dir / Path(output_path).with_suffix('.csv').name
     
-    def export(self, metadata: List[Dict]):
+    def export(self, metadata: List[Dict], digest: Optional[ForensicDigest] = None):
         """
         Exports metadata to CSV file.
         
         Args:
             metadata: List of dictionaries with metadata
+            digest: Precomputed ForensicDigest of metadata (computed if omitted)
         """
         if not metadata:
             print("⚠ No metadata to export")
@@ -145,24 +414,17 @@ class CSVExporter:
             'mime_type', 'description', 'parents'
         ])
         
-        sorted_metadata = sorted(metadata, key=lambda x: x.get('id', ''))
+        digest = digest or ForensicDigest(metadata)
         
-        with open(self.output_path, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_text(self.output_path) as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=columns, extrasaction='ignore')
             writer.writeheader()
             
-            for item in sorted_metadata:
+            for item in digest.sorted_metadata:
                 sorted_item = {k: item.get(k, '') for k in columns}
                 writer.writerow(sorted_item)
         
-        forensic_data_only = create_forensic_hash_data(metadata)
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as tmp_file:
-            json.dump(forensic_data_only, tmp_file, indent=None, separators=(',', ':'), ensure_ascii=False, sort_keys=True)
-            tmp_path = Path(tmp_file.name)
-        
-        file_hash = calculate_file_hash(tmp_path)
-        tmp_path.unlink()
+        file_hash = digest.hash
         
         print(f"✓ CSV exported: {self.output_path}")
         print(f"  Forensic Hash (SHA-256): {file_hash}")
@@ -182,23 +444,15 @@ class JSONExporter:
         
         self.output_path = output_dir / Path(output_path).with_suffix('.json').name
     
-    def export(self, metadata: List[Dict]):
+    def export(self, metadata: List[Dict], digest: Optional[ForensicDigest] = None):
         """
         Exports metadata to JSON file with additional information.
         
         Args:
             metadata: List of dictionaries with metadata
+            digest: Precomputed ForensicDigest of metadata (computed if omitted)
         """
-
-        forensic_data_only = create_forensic_hash_data(metadata)
-        
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as tmp_file:
-            json.dump(forensic_data_only, tmp_file, indent=None, separators=(',', ':'), ensure_ascii=False, sort_keys=True)
-            tmp_path = Path(tmp_file.name)
-        
-        file_hash = calculate_file_hash(tmp_path)
-        tmp_path.unlink()
+        file_hash = (digest or ForensicDigest(metadata)).hash
         
         export_data = {
             'extraction_metadata': {
@@ -211,12 +465,45 @@ class JSONExporter:
             'files': metadata
         }
         
-        with open(self.output_path, 'w', encoding='utf-8') as jsonfile:
-            json.dump(export_data, jsonfile, indent=2, ensure_ascii=False)
+        with open_binary(self.output_path) as jsonfile:
+            self._write_document(jsonfile, export_data)
         
         print(f"✓ JSON exported: {self.output_path}")
         print(f"  Forensic Hash (SHA-256): {file_hash}")
         print(f"  Note: Hash calculated on forensic data only (files), not extraction metadata")
+    
+    def _write_document(self, jsonfile, export_data: Dict):
+        """
+        Writes export_data as 2-space indented JSON, encoding one file record
+        at a time so the whole document is never held in memory. The output is
+        identical to dumping export_data in a single call.
+        
+        Args:
+            jsonfile: Binary file object
+            export_data: Dictionary with 'extraction_metadata' and 'files'
+        """
+        if orjson is not None:
+            def dumps(obj):
+                return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        else:
+            def dumps(obj):
+                return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+        
+        jsonfile.write(b'{\n  "extraction_metadata": ')
+        jsonfile.write(dumps(export_data['extraction_metadata']).replace(b'\n', b'\n  '))
+        jsonfile.write(b',\n  "files": ')
+        
+        files = export_data['files']
+        if not files:
+            jsonfile.write(b'[]')
+        else:
+            separator = b'[\n    '
+            for item in files:
+                jsonfile.write(separator)
+                jsonfile.write(dumps(item).replace(b'\n', b'\n    '))
+                separator = b',\n    '
+            jsonfile.write(b'\n  ]')
+        jsonfile.write(b'\n}')
 
 
 class PDFExporter:
@@ -231,77 +518,17 @@ class PDFExporter:
         output_dir.mkdir(exist_ok=True)
         
         self.output_path = output_dir / Path(output_path).with_suffix('.pdf').name
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-    
-    def _setup_custom_styles(self):
-        """Sets up custom styles for PDF"""
-        def add_style_safe(name, **kwargs):
-            if name not in self.styles.byName:
-                try:
-                    self.styles.add(ParagraphStyle(name=name, **kwargs))
-                except Exception:
-                    pass
-            if name in self.styles.byName:
-                style = self.styles.byName[name]
-                for key, value in kwargs.items():
-                    if hasattr(style, key):
-                        setattr(style, key, value)
-        
-        add_style_safe('ForensicTitle',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=12,
-            alignment=1
-        )
-        
-        add_style_safe('ForensicHeading',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=8
-        )
-        
-        add_style_safe('ForensicText',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=6
-        )
-        
-        add_style_safe('ForensicURL',
-            parent=self.styles['Normal'],
-            fontSize=7,
-            spaceAfter=4,
-            wordWrap='LTR',
-            leading=8
-        )
-        
-        add_style_safe('ForensicFooter',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            spaceAfter=0,
-            alignment=1,
-            textColor=colors.HexColor('#666666')
-        )
+        self.styles = get_forensic_styles()
     
-    def export(self, metadata: List[Dict]):
+    def export(self, metadata: List[Dict], digest: Optional[ForensicDigest] = None):
         """
         Exports metadata to PDF file formatted for legal presentation.
         
         Args:
             metadata: List of dictionaries with metadata
+            digest: Precomputed ForensicDigest of metadata (computed if omitted)
         """
-        forensic_data_only = create_forensic_hash_data(metadata)
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as tmp_file:
-            json.dump(forensic_data_only, tmp_file, indent=None, separators=(',', ':'), ensure_ascii=False, sort_keys=True)
-            tmp_path = Path(tmp_file.name)
-        
-        file_hash = calculate_file_hash(tmp_path)
-        tmp_path.unlink()
-        
-        self.forensic_hash = file_hash
+        file_hash = (digest or ForensicDigest(metadata)).hash
         
         doc = SimpleDocTemplate(
             str(self.output_path),
@@ -326,27 +553,20 @@ class PDFExporter:
         ]
         
         info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.grey),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (1, 0), (1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        info_table.setStyle(INFO_TABLE_STYLE)
         story.append(info_table)
         story.append(Spacer(1, 0.3*inch))
         
         story.append(Paragraph("STATISTICAL SUMMARY", self.styles['ForensicHeading']))
         
-        total_size = sum(int(m.get('size_bytes', 0) or 0) for m in metadata)
-        shared_files = sum(1 for m in metadata if m.get('shared', False))
-        file_types = {}
+        total_size = 0
+        shared_files = 0
+        file_types = Counter()
         for m in metadata:
-            file_type = m.get('file_type', 'Unknown')
-            file_types[file_type] = file_types.get(file_type, 0) + 1
+            total_size += int(m.get('size_bytes', 0) or 0)
+            if m.get('shared', False):
+                shared_files += 1
+            file_types[m.get('file_type', 'Unknown')] += 1
         
         stats_data = [
             ['Metric', 'Value'],
@@ -357,77 +577,14 @@ class PDFExporter:
         ]
         
         stats_table = Table(stats_data, colWidths=[3*inch, 3*inch])
-        stats_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
-            ('BACKGROUND', (1, 1), (1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        stats_table.setStyle(STATS_TABLE_STYLE)
         story.append(stats_table)
         story.append(Spacer(1, 0.3*inch))
         
         story.append(Paragraph("FILE DETAILS", self.styles['ForensicHeading']))
         story.append(Spacer(1, 0.1*inch))
         
-        files_to_show = metadata
-        
-        for idx, file_data in enumerate(files_to_show, 1):
-            if idx > 1:
-                story.append(Spacer(1, 0.1*inch))
-            
-            story.append(Paragraph(
-                f"File #{idx}: {file_data.get('name', 'N/A')}",
-                self.styles['ForensicHeading']
-            ))
-            
-            share_link = file_data.get('share_link', 'N/A')
-            url_value = share_link if share_link != 'N/A' else 'N/A'
-            
-            file_id = file_data.get('id', 'N/A')
-            file_table_data = [
-                ['Field', 'Value'],
-                ['ID', Paragraph(file_id, self.styles['ForensicURL'])],
-                ['Type', file_data.get('file_type', 'N/A')],
-                ['Path', file_data.get('full_path', 'N/A')],
-                ['Creation Date', file_data.get('creation_date', 'N/A')],
-                ['Modification Date', file_data.get('modification_date', 'N/A')],
-                ['Last Viewed', file_data.get('last_viewed_date', 'N/A')],
-                ['Size', file_data.get('size_formatted', 'N/A')],
-                ['Owner', Paragraph(f"{file_data.get('owner_name', 'N/A')} ({file_data.get('owner_email', 'N/A')})", self.styles['ForensicURL'])],
-                ['Last Modifier', Paragraph(f"{file_data.get('last_modifier_name', 'N/A')} ({file_data.get('last_modifier_email', 'N/A')})", self.styles['ForensicURL'])],
-                ['Shared', 'Yes' if file_data.get('shared') else 'No'],
-                ['MD5 Checksum', file_data.get('md5_checksum', 'N/A')],
-            ]
-            
-            file_table_data.append(['URL', Paragraph(url_value, self.styles['ForensicURL'])])
-            
-            file_table = Table(file_table_data, colWidths=[2*inch, 4*inch])
-            
-            table_style = TableStyle([
-                ('BACKGROUND', (0, 0), (0, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (0, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('FONTSIZE', (1, -1), (1, -1), 7),
-                ('VALIGN', (1, -1), (1, -1), 'TOP'),
-                ('LEFTPADDING', (1, -1), (1, -1), 4),
-                ('RIGHTPADDING', (1, -1), (1, -1), 4),
-            ])
-            
-            file_table.setStyle(table_style)
-            story.append(file_table)
-            
-            if idx < len(files_to_show):
-                story.append(Spacer(1, 0.15*inch))
+        story.extend(self._file_flowables(metadata))
         
         story.append(PageBreak())
         story.append(Paragraph("LEGAL NOTICE", self.styles['ForensicHeading']))
@@ -457,69 +614,79 @@ class PDFExporter:
             self.styles['ForensicText']
         ))
         
-        self._max_page = 0
-        self.total_pages = None
-        
-        doc.build(story, onFirstPage=self._add_footer, onLaterPages=self._add_footer)
-        
-        try:
-            import PyPDF2
-            with open(self.output_path, 'rb') as pdf_file:
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                total_pages = len(pdf_reader.pages)
-            
-            if total_pages != self._max_page and total_pages > 0:
-                self.total_pages = total_pages
-                import os
-                if os.path.exists(self.output_path):
-                    os.remove(self.output_path)
-                self._max_page = 0
-                doc.build(story, onFirstPage=self._add_footer, onLaterPages=self._add_footer)
-            else:
-                self.total_pages = self._max_page if self._max_page > 0 else 1
-        except ImportError:
-            self.total_pages = self._max_page if self._max_page > 0 else 1
-        except Exception as e:
-            self.total_pages = self._max_page if self._max_page > 0 else 1
+        doc.build(story, canvasmaker=partial(NumberedCanvas, forensic_hash=file_hash))
         print(f"✓ PDF exported: {self.output_path}")
         print(f"  Forensic Hash (SHA-256): {file_hash}")
         print(f"  Note: PDF hash includes generation timestamp. For deterministic hash, use JSON/CSV files.")
     
-    def _add_footer(self, canvas, doc):
+    def _file_flowables(self, metadata: List[Dict]):
         """
-        Add footer with forensic hash and page numbers to all pages.
+        Yields the "FILE DETAILS" flowables (heading and table) of every file.
         
         Args:
-            canvas: ReportLab canvas object
-            doc: Document object
-        """
-        canvas.saveState()
-        page_width = doc.pagesize[0]
-        footer_y = 8 * mm
-        gray_color = colors.HexColor('#666666')
-        canvas.setFillColor(gray_color)
-        canvas.setFont("Helvetica", 7)
-        current_page = canvas.getPageNumber()
-
-        self._max_page = max(self._max_page, current_page)
-        
-        total_pages = self.total_pages if self.total_pages is not None else self._max_page
-        hash_text = f"SHA-256: {self.forensic_hash}"
-        canvas.drawCentredString(page_width / 2.0, footer_y + 10, hash_text)
+            metadata: List of dictionaries with metadata
         
-        if total_pages > 0:
-            page_num_text = f"{current_page}/{total_pages}"
-        else:
-            page_num_text = f"{current_page}"
+        Yields:
+            ReportLab flowables in story order
+        """
+        for idx, file_data in enumerate(metadata, 1):
+            if idx > 1:
+                yield Spacer(1, 0.1*inch)
+            
+            yield Paragraph(
+                f"File #{idx}: {file_data.get('name', 'N/A')}",
+                self.styles['ForensicHeading']
+            )
+            
+            share_link = file_data.get('share_link', 'N/A')
+            url_value = share_link if share_link != 'N/A' else 'N/A'
+            
+            file_id = file_data.get('id', 'N/A')
+            file_table_data = [
+                ['Field', 'Value'],
+                ['ID', self._value_cell(file_id)],
+                ['Type', file_data.get('file_type', 'N/A')],
+                ['Path', file_data.get('full_path', 'N/A')],
+                ['Creation Date', file_data.get('creation_date', 'N/A')],
+                ['Modification Date', file_data.get('modification_date', 'N/A')],
+                ['Last Viewed', file_data.get('last_viewed_date', 'N/A')],
+                ['Size', file_data.get('size_formatted', 'N/A')],
+                ['Owner', self._value_cell(f"{file_data.get('owner_name', 'N/A')} ({file_data.get('owner_email', 'N/A')})")],
+                ['Last Modifier', self._value_cell(f"{file_data.get('last_modifier_name', 'N/A')} ({file_data.get('last_modifier_email', 'N/A')})")],
+                ['Shared', 'Yes' if file_data.get('shared') else 'No'],
+                ['MD5 Checksum', file_data.get('md5_checksum', 'N/A')],
+            ]
+            
+            file_table_data.append(['URL', self._value_cell(url_value)])
+            
+            file_table = Table(file_table_data, colWidths=[2*inch, 4*inch])
+            
+            file_table.setStyle(FILE_TABLE_STYLE)
+            yield file_table
+            
+            if idx < len(metadata):
+                yield Spacer(1, 0.15*inch)
+    
+    def _value_cell(self, text: str):
+        """
+        Builds a small-print table cell. Text that fits on one line is returned
+        as a plain string, which Table draws without parsing it; longer text is
+        wrapped in a Paragraph with its markup characters escaped.
         
-        canvas.drawCentredString(page_width / 2.0, footer_y, page_num_text)
+        Args:
+            text: Cell text
         
-        canvas.restoreState()
+        Returns:
+            str or Paragraph
+        """
+        style = self.styles['ForensicURL']
+        if stringWidth(text, style.fontName, style.fontSize) <= VALUE_CELL_WIDTH:
+            return text
+        return Paragraph(escape(text), style)
     
     def _format_size(self, size_bytes: int) -> str:
         """Formats size in bytes"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
+        if size_bytes < 1024:
+            return f"{size_bytes:.2f} B"
+        exponent = min(len(SIZE_UNITS) - 1, (int(size_bytes).bit_length() - 1) // 10)
+        return f"{size_bytes / (1 << (10 * exponent)):.2f} {SIZE_UNITS[exponent]}"
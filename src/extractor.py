@@ -1,38 +1,172 @@
 """
 Main module for extracting metadata from files in Google Drive
+
+Every API call passes an explicit partial-response `fields` mask that
+names only the properties the exporters use.
 """
 import os
+import re
+import json
+import time
+import random
 from datetime import datetime
-from typing import List, Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Iterator, Optional
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from threading import Lock
 from googleapiclient.errors import HttpError
 from tqdm import tqdm
 
+BATCH_SIZE = 100
+# Drive counts every call inside a batch against the per-user quota
+BATCH_CALLS_PER_SECOND = 10
+BACKENDS = ('thread', 'process')
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+MAX_RETRIES = 6
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+RATE_LIMIT_REASONS = ('userRateLimitExceeded', 'rateLimitExceeded')
+# Dropped connections and timeouts, raised by both the httplib2 and HTTP/2 transports
+NETWORK_ERRORS = (ConnectionError, TimeoutError)
+PROCESS_CHUNK_SIZE = 500
+PROCESS_CHUNKS_IN_FLIGHT = 2
+PROGRESS_INTERVAL = 0.1
+LIST_FANOUT = 4
+MAX_LIST_THREADS = 32
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+_EMPTY = {}
+FILE_TYPE_NAMES = {
+    FOLDER_MIME_TYPE: 'Folder',
+    'application/vnd.google-apps.document': 'Google Docs',
+    'application/vnd.google-apps.spreadsheet': 'Google Sheets',
+    'application/vnd.google-apps.presentation': 'Google Slides',
+    'application/pdf': 'PDF',
+    'image/jpeg': 'JPEG Image',
+    'image/png': 'PNG Image',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'Word',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': 'Excel',
+    'text/plain': 'Text',
+}
+DRIVE_TIMESTAMP_RE = re.compile(r'[1-9]\d{3}-(0[1-9]|1[0-2])-(0[1-9]|1\d|2[0-8])T([01]\d|2[0-3]):[0-5]\d:[0-5]\d(\.\d+)?Z\Z', re.ASCII)
+
+
+def is_retryable_error(error: HttpError) -> bool:
+    """
+    Determines whether a Drive API error is transient and worth retrying.
+    403 responses are only retried when Google reports a rate-limit reason.
+    
+    Args:
+        error: HttpError raised by the API client
+    
+    Returns:
+        True if the request should be retried
+    """
+    status = int(error.resp.status)
+    if status in RETRYABLE_STATUSES:
+        return True
+    if status != 403:
+        return False
+    try:
+        details = json.loads(error.content.decode('utf-8'))['error'].get('errors', [])
+    except (ValueError, KeyError, AttributeError, TypeError):
+        return False
+    return any(detail.get('reason') in RATE_LIMIT_REASONS for detail in details)
+
+
+@lru_cache(maxsize=4096)
+def _format_datetime(dt_string: str) -> str:
+    """
+    Formats a non-empty Drive timestamp (see MetadataExtractor.format_datetime).
+    Drive's fixed "YYYY-MM-DDTHH:MM:SS.sssZ" layout is reformatted by slicing
+    when the pattern alone proves the date valid: DRIVE_TIMESTAMP_RE only
+    accepts days 01-28, which exist in every month. Days 29-31, like anything
+    else, go through datetime.fromisoformat.
+    """
+    if DRIVE_TIMESTAMP_RE.match(dt_string):
+        return f"{dt_string[:10]} {dt_string[11:19]} UTC"
+    try:
+        dt = datetime.fromisoformat(dt_string.replace('Z', '+00:00'))
+        return dt.strftime('%Y-%m-%d %H:%M:%S UTC')
+    except:
+        return dt_string
+
+
+class RateLimiter:
+    """Spaces out API requests so that at most max_qps are issued per second"""
+    
+    def __init__(self, max_qps: float):
+        """
+        Args:
+            max_qps: Maximum number of API requests per second
+        """
+        self.interval = 1.0 / max_qps
+        self.next_slot = time.monotonic()
+        self.lock = Lock()
+    
+    def acquire(self, count: int = 1):
+        """
+        Blocks until count requests may be issued.
+        
+        Args:
+            count: Number of API requests about to be sent
+        """
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval * count
+        if slot > now:
+            time.sleep(slot - now)
+
 
 class MetadataExtractor:
     """Forensic metadata extractor for Google Drive"""
     
-    def __init__(self, service, max_workers: Optional[int] = None):
+    def __init__(self, service, max_workers: Optional[int] = None,
+                 use_batch: bool = True, backend: str = 'thread', cache=None,
+                 max_qps: Optional[float] = None):
         """
         Initializes the extractor with an authenticated Google Drive service.
         
         Args:
             service: Authenticated Google Drive service
-            max_workers: Maximum number of parallel workers (default: CPU count * 2)
+            max_workers: Number of worker processes for the 'process' backend and
+                scale of the API request fan-out (default: CPU count for
+                'process', 1 for 'thread')
+            use_batch: Whether to coalesce API calls into batch HTTP requests
+            backend: How files are processed: 'thread' formats them in the calling
+                thread (the work is pure CPU, so extra threads would only contend
+                for the GIL; threads are used for API calls instead), 'process'
+                spreads them over a pool of max_workers processes
+            cache: Optional ListingCache used to reuse listings between runs
+            max_qps: Optional cap on API requests per second shared by all workers;
+                without it, batches are paced at BATCH_CALLS_PER_SECOND calls
+        
+        Raises:
+            ValueError: If backend is not one of BACKENDS
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Expected one of: {', '.join(BACKENDS)}")
+        
         self.service = service
+        self.use_batch = use_batch
+        self.backend = backend
+        self.cache = cache
+        self.rate_limiter = RateLimiter(max_qps) if max_qps else None
+        self.batch_rate_limiter = None if self.rate_limiter else RateLimiter(BATCH_CALLS_PER_SECOND)
         self.fields = (
             'id, name, mimeType, createdTime, modifiedTime, viewedByMeTime, '
-            'size, owners, webViewLink, sharingUser, permissions, '
-            'parents, md5Checksum, version, capabilities, shared, '
-            'trashed, starred, description, lastModifyingUser'
+            'size, owners(emailAddress,displayName), webViewLink, '
+            'sharingUser(emailAddress), permissions(type,role), '
+            'parents, md5Checksum, version, shared, '
+            'trashed, starred, description, '
+            'lastModifyingUser(emailAddress,displayName)'
         )
-        self.path_cache = {}
-        self.path_cache_lock = Lock()
+        self.string_pool = {}
         if max_workers is None:
-            max_workers = 1
-        self.max_workers = max(1, min(max_workers, 4))
+            max_workers = (os.cpu_count() or 1) if backend == 'process' else 1
+        self.max_workers = max(1, max_workers)
     
     def format_datetime(self, dt_string: Optional[str]) -> Optional[str]:
         """
@@ -46,11 +180,7 @@ class MetadataExtractor:
         """
         if not dt_string:
             return None
-        try:
-            dt = datetime.fromisoformat(dt_string.replace('Z', '+00:00'))
-            return dt.strftime('%Y-%m-%d %H:%M:%S UTC')
-        except:
-            return dt_string
+        return _format_datetime(dt_string)
     
     def format_size(self, size_bytes: Optional[str]) -> str:
         """
@@ -66,82 +196,35 @@ class MetadataExtractor:
             return "N/A"
         try:
             size = int(size_bytes)
-            for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-                if size < 1024.0:
-                    return f"{size:.2f} {unit}"
-                size /= 1024.0
-            return f"{size:.2f} PB"
         except:
             return size_bytes
+        if size < 1024:
+            return f"{size:.2f} B"
+        exponent = (size.bit_length() - 1) // 10
+        if exponent >= len(SIZE_UNITS):
+            exponent = len(SIZE_UNITS) - 1
+        return f"{size / (1 << (10 * exponent)):.2f} {SIZE_UNITS[exponent]}"
     
     def get_file_path(self, file_id: str, file_name: str) -> str:
         """
-        Gets the complete path of a file in Google Drive.
-        Uses caching to avoid redundant API calls.
-        Simplified to reduce API calls and memory usage.
+        Gets the path of a file in Google Drive. Resolving the parent chain
+        would cost one API call per ancestor, so the file name is used.
         
         Args:
             file_id: File ID
             file_name: File name
         
         Returns:
-            Complete file path (simplified to avoid too many API calls)
+            File path (the file name)
         """
         return file_name
-        
-        """
-        with self.path_cache_lock:
-            if file_id in self.path_cache:
-                return self.path_cache[file_id]
-        
-        try:
-            path_parts = []
-            current_id = file_id
-            visited_ids = set()
-            max_depth = 10
-            
-            depth = 0
-            while current_id and current_id not in visited_ids and depth < max_depth:
-                visited_ids.add(current_id)
-                depth += 1
-                
-                with self.path_cache_lock:
-                    if current_id in self.path_cache:
-                        cached_path = self.path_cache[current_id]
-                        if path_parts:
-                            return '/'.join([cached_path] + path_parts)
-                        return cached_path
-                
-                try:
-                    file = self.service.files().get(
-                        fileId=current_id,
-                        fields='name, parents'
-                    ).execute()
-                    
-                    name = file.get('name', 'Unknown')
-                    path_parts.insert(0, name)
-                    
-                    parents = file.get('parents')
-                    if parents and len(parents) > 0:
-                        current_id = parents[0]
-                    else:
-                        break
-                except HttpError:
-                    break
-            
-            result = '/'.join(path_parts) if path_parts else file_name
-            
-            with self.path_cache_lock:
-                self.path_cache[file_id] = result
-            
-            return result
-        except Exception:
-            return file_name
-        """
     
     def extract_file_metadata(self, file: Dict) -> Dict:
         """
         Extracts all forensic metadata from a file.
+        Low-cardinality values (MIME and file types, users, permissions and
+        parents) are deduplicated through self.string_pool, so a large scan
+        keeps one copy of each distinct string instead of one per file.
         
         Args:
             file: Dictionary with file data from Google Drive API
@@ -149,43 +232,58 @@ class MetadataExtractor:
         Returns:
             Dictionary with extracted and formatted metadata
         """
-        owners = file.get('owners', [])
-        owner_email = owners[0].get('emailAddress', 'N/A') if owners else 'N/A'
-        owner_name = owners[0].get('displayName', 'N/A') if owners else 'N/A'
+        pooled = self.string_pool.setdefault
+        
+        owner = (file.get('owners') or (_EMPTY,))[0]
+        owner_email = owner.get('emailAddress', 'N/A')
+        owner_name = owner.get('displayName', 'N/A')
         
-        last_modifying_user = file.get('lastModifyingUser', {})
+        last_modifying_user = file.get('lastModifyingUser') or _EMPTY
         last_modifier_email = last_modifying_user.get('emailAddress', 'N/A')
         last_modifier_name = last_modifying_user.get('displayName', 'N/A')
         
-        sharing_user = file.get('sharingUser', {})
-        sharing_user_email = sharing_user.get('emailAddress', 'N/A')
+        sharing_user_email = (file.get('sharingUser') or _EMPTY).get('emailAddress', 'N/A')
+        
+        file_id = file.get('id')
+        name = file.get('name')
+        mime = file.get('mimeType')
+        created = file.get('createdTime')
+        modified = file.get('modifiedTime')
+        size = file.get('size')
         
-        file_path = self.get_file_path(file.get('id'), file.get('name', 'Unknown'))
+        file_path = self.get_file_path(file_id, name if name is not None else 'Unknown')
         
-        permissions = file.get('permissions', [])
-        permission_types = []
-        for perm in permissions:
-            perm_type = perm.get('type', 'unknown')
-            role = perm.get('role', 'unknown')
-            permission_types.append(f"{perm_type}:{role}")
+        permissions = file.get('permissions') or ()
+        permission_summary = 'N/A'
+        if permissions:
+            permission_types = []
+            for perm in permissions:
+                perm_type = perm.get('type', 'unknown')
+                role = perm.get('role', 'unknown')
+                permission_types.append(f"{perm_type}:{role}")
+            permission_summary = '; '.join(permission_types)
+        
+        mime_type = mime if mime is not None else 'N/A'
+        file_type = self._get_file_type(mime if mime is not None else '')
+        parents = '; '.join(file.get('parents', []))
         
         metadata = {
-            'id': file.get('id', 'N/A'),
-            'name': file.get('name', 'N/A'),
-            'mime_type': file.get('mimeType', 'N/A'),
-            'file_type': self._get_file_type(file.get('mimeType', '')),
-            'creation_date': self.format_datetime(file.get('createdTime')),
-            'modification_date': self.format_datetime(file.get('modifiedTime')),
+            'id': file_id if file_id is not None else 'N/A',
+            'name': name if name is not None else 'N/A',
+            'mime_type': pooled(mime_type, mime_type),
+            'file_type': pooled(file_type, file_type),
+            'creation_date': self.format_datetime(created),
+            'modification_date': self.format_datetime(modified),
             'last_viewed_date': self.format_datetime(file.get('viewedByMeTime')),
-            'creation_date_raw': file.get('createdTime', 'N/A'),
-            'modification_date_raw': file.get('modifiedTime', 'N/A'),
-            'size_bytes': file.get('size', '0'),
-            'size_formatted': self.format_size(file.get('size')),
-            'owner_email': owner_email,
-            'owner_name': owner_name,
-            'last_modifier_email': last_modifier_email,
-            'last_modifier_name': last_modifier_name,
-            'sharing_user_email': sharing_user_email,
+            'creation_date_raw': created if created is not None else 'N/A',
+            'modification_date_raw': modified if modified is not None else 'N/A',
+            'size_bytes': size if size is not None else '0',
+            'size_formatted': self.format_size(size),
+            'owner_email': pooled(owner_email, owner_email),
+            'owner_name': pooled(owner_name, owner_name),
+            'last_modifier_email': pooled(last_modifier_email, last_modifier_email),
+            'last_modifier_name': pooled(last_modifier_name, last_modifier_name),
+            'sharing_user_email': pooled(sharing_user_email, sharing_user_email),
             'full_path': file_path,
             'share_link': file.get('webViewLink', 'N/A'),
             'shared': file.get('shared', False),
@@ -194,28 +292,19 @@ class MetadataExtractor:
             'description': file.get('description', ''),
             'md5_checksum': file.get('md5Checksum', 'N/A'),
             'version': file.get('version', 'N/A'),
-            'permissions': '; '.join(permission_types) if permission_types else 'N/A',
+            'permissions': pooled(permission_summary, permission_summary),
             'permission_count': len(permissions),
-            'parents': '; '.join(file.get('parents', [])),
+            'parents': pooled(parents, parents),
         }
         
         return metadata
     
     def _get_file_type(self, mime_type: str) -> str:
         """Determines file type based on MIME type"""
-        type_mapping = {
-            'application/vnd.google-apps.folder': 'Folder',
-            'application/vnd.google-apps.document': 'Google Docs',
-            'application/vnd.google-apps.spreadsheet': 'Google Sheets',
-            'application/vnd.google-apps.presentation': 'Google Slides',
-            'application/pdf': 'PDF',
-            'image/jpeg': 'JPEG Image',
-            'image/png': 'PNG Image',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'Word',
-            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': 'Excel',
-            'text/plain': 'Text',
-        }
-        return type_mapping.get(mime_type, mime_type.split('/')[-1].upper())
+        file_type = FILE_TYPE_NAMES.get(mime_type)
+        if file_type is None:
+            file_type = mime_type.rsplit('/', 1)[-1].upper()
+        return file_type
     
     def _process_file(self, file: Dict) -> Optional[Dict]:
         """
@@ -233,10 +322,146 @@ class MetadataExtractor:
         except Exception as e:
             return None
     
+    def _process_files(self, files: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Processes a chunk of files in one worker call, so the cost of
+        dispatching work to the pool is paid once per chunk instead of once
+        per file.
+        
+        Args:
+            files: File dictionaries from Google Drive API
+        
+        Returns:
+            Metadata dictionaries (None for files that failed), in input order
+        """
+        process_file = self._process_file
+        return [process_file(file) for file in files]
+    
+    def _execute(self, request, cost: int = 1):
+        """
+        Executes an API request, retrying transient API and network errors
+        with decorrelated jitter backoff.
+        
+        Args:
+            request: googleapiclient HttpRequest or BatchHttpRequest
+            cost: Number of API calls the request counts for against the quota
+        
+        Returns:
+            The API response
+        
+        Raises:
+            HttpError: If the error is not transient or retries are exhausted
+            ConnectionError, TimeoutError: If the network error persists after all retries
+        """
+        delay = RETRY_BASE_DELAY
+        for attempt in range(MAX_RETRIES + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire(cost)
+            try:
+                return request.execute()
+            except HttpError as error:
+                if attempt == MAX_RETRIES or not is_retryable_error(error):
+                    raise
+            except NETWORK_ERRORS:
+                if attempt == MAX_RETRIES:
+                    raise
+            delay = min(RETRY_MAX_DELAY, random.uniform(RETRY_BASE_DELAY, delay * 3))
+            time.sleep(delay)
+    
+    def _execute_batch(self, requests: List) -> List[Dict]:
+        """
+        Executes API requests using multipart/mixed batch HTTP requests.
+        Groups up to BATCH_SIZE calls per HTTP round-trip. Each call in a batch
+        counts against the per-user quota, so batches are spaced to send at
+        most BATCH_CALLS_PER_SECOND calls per second (or max_qps, when set,
+        through the shared rate limiter). Calls that fail with a
+        transient error are retried in a later batch. With batching disabled
+        the calls are sent concurrently from a thread pool instead, so their
+        round-trips overlap.
+        
+        Args:
+            requests: List of googleapiclient HttpRequest objects
+        
+        Returns:
+            List of responses in the same order as the requests
+        
+        Raises:
+            HttpError: If any request fails permanently
+        """
+        if len(requests) <= 1:
+            return [self._execute(request) for request in requests]
+        
+        if not self.use_batch:
+            with ThreadPoolExecutor(max_workers=min(len(requests), self.max_workers * LIST_FANOUT, MAX_LIST_THREADS)) as executor:
+                return list(executor.map(self._execute, requests))
+        
+        responses = [None] * len(requests)
+        pending = list(range(len(requests)))
+        delay = RETRY_BASE_DELAY
+        
+        for attempt in range(MAX_RETRIES + 1):
+            failures = {}
+            
+            def callback(request_id, response, exception):
+                if exception is not None:
+                    failures[int(request_id)] = exception
+                else:
+                    responses[int(request_id)] = response
+            
+            for batch_start in range(0, len(pending), BATCH_SIZE):
+                chunk = pending[batch_start:batch_start + BATCH_SIZE]
+                if self.batch_rate_limiter:
+                    self.batch_rate_limiter.acquire(len(chunk))
+                batch = self.service.new_batch_http_request(callback=callback)
+                for index in chunk:
+                    batch.add(requests[index], request_id=str(index))
+                self._execute(batch, cost=len(chunk))
+            
+            if not failures:
+                return responses
+            
+            for error in failures.values():
+                if attempt == MAX_RETRIES or not is_retryable_error(error):
+                    raise error
+            
+            pending = sorted(failures)
+            delay = min(RETRY_MAX_DELAY, random.uniform(RETRY_BASE_DELAY, delay * 3))
+            time.sleep(delay)
+        
+        return responses
+    
+    def _list_children(self, folder_id: str, include_trashed: bool, page_token: Optional[str] = None):
+        """
+        Builds a files.list request for the direct children of a folder.
+        
+        Args:
+            folder_id: ID of the parent folder
+            include_trashed: Whether to include trashed files
+            page_token: Token of the page to fetch (None for the first page)
+        
+        Returns:
+            googleapiclient HttpRequest (not yet executed)
+        """
+        query_parts = [f"'{folder_id}' in parents"]
+        if not include_trashed:
+            query_parts.append("trashed = false")
+        
+        return self.service.files().list(
+            q=" and ".join(query_parts),
+            pageSize=1000,
+            fields=f"nextPageToken, files({self.fields})",
+            pageToken=page_token,
+            orderBy="createdTime",
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        )
+    
     def _collect_files_recursively(self, folder_id: str, include_trashed: bool, 
                                    progress_callback=None, visited_folders=None) -> List[Dict]:
         """
         Recursively collects all files from a folder and its subfolders.
+        Folders are scanned level by level so the pages of sibling folders
+        are fetched together in batch requests.
         
         Args:
             folder_id: ID of folder to scan
@@ -250,69 +475,250 @@ class MetadataExtractor:
         if visited_folders is None:
             visited_folders = set()
         
-        if folder_id in visited_folders:
-            return []
+        all_files = []
+        pending_folders = [folder_id]
+        
+        try:
+            while pending_folders:
+                level = []
+                for pending_id in pending_folders:
+                    if pending_id and pending_id not in visited_folders:
+                        visited_folders.add(pending_id)
+                        level.append(pending_id)
+                pending_folders = []
+                
+                if not level:
+                    break
+                
+                level_pages = self._list_level(level, include_trashed, progress_callback, len(all_files))
+                
+                for current_id in level:
+                    for results in level_pages[current_id]:
+                        for file in results.get('files', []):
+                            if file.get('mimeType') == FOLDER_MIME_TYPE:
+                                pending_folders.append(file.get('id'))
+                            else:
+                                all_files.append(file)
+                
+                if progress_callback:
+                    progress_callback('collecting', len(all_files), 0, 
+                                    f'Found {len(all_files)} files, scanning {len(pending_folders)} subfolders...')
+                    
+        except HttpError as error:
+            if progress_callback:
+                progress_callback('error', 0, 0, f'API error scanning folder {folder_id}: {error}')
+            raise
+        
+        return all_files
+    
+    def _list_level(self, folder_ids: List[str], include_trashed: bool,
+                    progress_callback=None, files_found: int = 0) -> Dict[str, List[Dict]]:
+        """
+        Lists every page of the direct children of a set of folders.
+        Each round sends one batch containing the next page of every folder
+        that still has one, so continuation pages are batched as well.
+        
+        Args:
+            folder_ids: IDs of the folders to list
+            include_trashed: Whether to include trashed files
+            progress_callback: Optional callback function
+            files_found: Number of files found before this level (for progress)
+        
+        Returns:
+            Dictionary mapping each folder ID to its files.list pages, in order
+        """
+        pages = {folder_id: [] for folder_id in folder_ids}
+        pending = [(folder_id, None) for folder_id in folder_ids]
+        
+        while pending:
+            responses = self._execute_batch(
+                [self._list_children(folder_id, include_trashed, page_token) for folder_id, page_token in pending]
+            )
+            
+            next_pending = []
+            for (folder_id, _), results in zip(pending, responses):
+                pages[folder_id].append(results)
+                files_found += len(results.get('files', []))
+                page_token = results.get('nextPageToken')
+                if page_token and results.get('files'):
+                    next_pending.append((folder_id, page_token))
+            pending = next_pending
+            
+            if progress_callback and pending:
+                progress_callback('collecting', files_found, 0,
+                                f'Found {files_found} items, fetching {len(pending)} more pages...')
+        
+        return pages
+    
+    def _collect_drive_files(self, include_trashed: bool, progress_callback=None) -> List[Dict]:
+        """
+        Collects all files in the entire Drive.
         
-        visited_folders.add(folder_id)
+        Args:
+            include_trashed: Whether to include trashed files
+            progress_callback: Optional callback function
+        
+        Returns:
+            List of file dictionaries
+        """
         all_files = []
         page_token = None
         
-        query_parts = [f"'{folder_id}' in parents"]
+        query_parts = []
         if not include_trashed:
             query_parts.append("trashed = false")
         
-        query = " and ".join(query_parts)
+        query = " and ".join(query_parts) if query_parts else None
         
-        try:
-            while True:
-                results = self.service.files().list(
+        while True:
+            try:
+                results = self._execute(self.service.files().list(
                     q=query,
                     pageSize=1000,
-                    fields=f"nextPageToken, files(id, name, mimeType, {self.fields})",
+                    fields=f"nextPageToken, files({self.fields})",
                     pageToken=page_token,
                     orderBy="createdTime"
-                ).execute()
+                ))
                 
                 files = results.get('files', [])
                 if not files:
                     break
                 
-                folders_to_scan = []
-                for file in files:
-                    if file.get('mimeType') == 'application/vnd.google-apps.folder':
-                        folders_to_scan.append(file)
-                    else:
-                        all_files.append(file)
+                all_files.extend(files)
                 
                 if progress_callback:
                     progress_callback('collecting', len(all_files), 0, 
-                                    f'Found {len(all_files)} files, scanning {len(folders_to_scan)} subfolders...')
-                
-                for folder in folders_to_scan:
-                    subfolder_id = folder.get('id')
-                    if subfolder_id and subfolder_id not in visited_folders:
-                        subfolder_files = self._collect_files_recursively(
-                            subfolder_id, include_trashed, progress_callback, visited_folders
-                        )
-                        all_files.extend(subfolder_files)
+                                    f'Found {len(all_files)} files so far...')
                 
                 page_token = results.get('nextPageToken')
                 if not page_token:
                     break
                     
-        except HttpError as error:
-            if progress_callback:
-                progress_callback('error', 0, 0, f'API error scanning folder {folder_id}: {error}')
-            raise
+            except HttpError as error:
+                if progress_callback:
+                    progress_callback('error', 0, 0, f'API error: {error}')
+                raise
+        
+        return all_files
+    
+    def _collect_files(self, folder_id: Optional[str], include_trashed: bool,
+                       progress_callback=None) -> List[Dict]:
+        """
+        Collects the file list for a scan.
+        When a listing cache is configured, only the changes since the
+        previous run are fetched; otherwise the folder tree is listed.
+        
+        Args:
+            folder_id: ID of folder to scan (None for entire Drive)
+            include_trashed: Whether to include trashed files
+            progress_callback: Optional callback function
+        
+        Returns:
+            List of file dictionaries
+        """
+        if self.cache is None:
+            if folder_id:
+                return self._collect_files_recursively(folder_id, include_trashed, progress_callback)
+            return self._collect_drive_files(include_trashed, progress_callback)
         
+        start_page_token = self.cache.get_start_page_token()
+        if start_page_token:
+            try:
+                if self._apply_changes(folder_id, include_trashed, start_page_token, progress_callback):
+                    return self.cache.load_files()
+            except HttpError:
+                pass
+        
+        start_page_token = self._execute(self.service.changes().getStartPageToken(
+            supportsAllDrives=True
+        )).get('startPageToken')
+        folders = set()
+        if folder_id:
+            all_files = self._collect_files_recursively(folder_id, include_trashed, progress_callback, folders)
+        else:
+            all_files = self._collect_drive_files(include_trashed, progress_callback)
+        
+        self.cache.replace(all_files, folders, start_page_token)
         return all_files
     
+    def _apply_changes(self, folder_id: Optional[str], include_trashed: bool,
+                       page_token: str, progress_callback=None) -> bool:
+        """
+        Updates the listing cache with the Changes API deltas since the last run.
+        
+        Args:
+            folder_id: ID of folder to scan (None for entire Drive)
+            include_trashed: Whether to include trashed files
+            page_token: Changes API token stored with the cached listing
+            progress_callback: Optional callback function
+        
+        Returns:
+            True if the cache is up to date, False if the folder tree changed
+            shape and a full scan is required
+        """
+        folders = self.cache.load_folders()
+        upserts = {}
+        removals = set()
+        
+        while True:
+            results = self._execute(self.service.changes().list(
+                pageToken=page_token,
+                pageSize=1000,
+                includeRemoved=True,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+                fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({self.fields}, driveId))"
+            ))
+            
+            for change in results.get('changes', []):
+                file_id = change.get('fileId')
+                file = change.get('file')
+                # The whole-Drive scan lists the user corpus only, so shared
+                # drive files are out of scope there; folder scans include them
+                on_shared_drive = bool(file and file.pop('driveId', None))
+                
+                if (change.get('removed') or not file or (file.get('trashed') and not include_trashed)
+                        or (on_shared_drive and not folder_id)):
+                    if file_id in folders:
+                        return False
+                    removals.add(file_id)
+                    upserts.pop(file_id, None)
+                    continue
+                
+                if folder_id:
+                    in_scope = any(parent in folders for parent in file.get('parents', []))
+                    if file.get('mimeType') == FOLDER_MIME_TYPE:
+                        if in_scope != (file_id in folders):
+                            return False
+                        continue
+                    if not in_scope:
+                        removals.add(file_id)
+                        upserts.pop(file_id, None)
+                        continue
+                
+                upserts[file_id] = file
+                removals.discard(file_id)
+            
+            if progress_callback:
+                progress_callback('collecting', len(upserts), 0,
+                                f'Found {len(upserts)} changed files since last scan...')
+            
+            if 'newStartPageToken' in results:
+                page_token = results['newStartPageToken']
+                break
+            page_token = results.get('nextPageToken')
+        
+        self.cache.apply_changes(list(upserts.values()), list(removals), page_token)
+        return True
+    
     def extract_folder(self, folder_id: Optional[str] = None, 
                       include_trashed: bool = False, 
                       progress_callback=None) -> List[Dict]:
         """
         Extracts metadata from all files in a folder or entire Drive.
-        Recursively scans all subfolders when a folder_id is provided.
+        Recursively scans all subfolders when a folder_id is provided,
+        following only that subtree via "'<parent>' in parents" queries;
+        the entire Drive is listed only when folder_id is None.
         Uses parallel processing for improved performance.
         
         Args:
@@ -323,140 +729,124 @@ class MetadataExtractor:
         Returns:
             List of dictionaries with metadata for each file
         """
-        all_files = []
-        page_token = None
+        return list(self.iter_folder(folder_id, include_trashed, progress_callback))
+    
+    def iter_folder(self, folder_id: Optional[str] = None, 
+                    include_trashed: bool = False, 
+                    progress_callback=None) -> Iterator[Dict]:
+        """
+        Yields metadata for each file in a folder or entire Drive as soon as
+        it is processed. Raw API file dictionaries are released once their
+        metadata has been extracted, so only one copy of each file is held.
+        
+        Args:
+            folder_id: ID of folder to scan (None for entire Drive)
+            include_trashed: Whether to include trashed files
+            progress_callback: Optional callback function(status, progress, total, message)
         
+        Yields:
+            Dictionary with metadata for each file
+        """
         if progress_callback:
             progress_callback('collecting', 0, 0, 'Collecting file list from Google Drive...')
         
         try:
-            if folder_id:
-                all_files = self._collect_files_recursively(folder_id, include_trashed, progress_callback)
-            else:
-                query_parts = []
-                if not include_trashed:
-                    query_parts.append("trashed = false")
-                
-                query = " and ".join(query_parts) if query_parts else None
-                
-                page_count = 0
-                while True:
-                    try:
-                        results = self.service.files().list(
-                            q=query,
-                            pageSize=1000,
-                            fields=f"nextPageToken, files({self.fields})",
-                            pageToken=page_token,
-                            orderBy="createdTime"
-                        ).execute()
-                        
-                        files = results.get('files', [])
-                        if not files:
-                            break
-                        
-                        all_files.extend(files)
-                        page_count += 1
-                        
-                        if progress_callback:
-                            progress_callback('collecting', len(all_files), 0, 
-                                            f'Found {len(all_files)} files so far...')
-                        
-                        page_token = results.get('nextPageToken')
-                        if not page_token:
-                            break
-                            
-                    except HttpError as error:
-                        if progress_callback:
-                            progress_callback('error', 0, 0, f'API error: {error}')
-                        raise
+            pending_files = deque(self._collect_files(folder_id, include_trashed, progress_callback))
+            total_files = len(pending_files)
             
-            if not all_files:
+            if not pending_files:
                 if progress_callback:
                     progress_callback('error', 0, 0, 'No files found to extract')
-                return []
+                return
             
+            processing_workers = self.max_workers if self.backend == 'process' else 1
             if progress_callback:
-                progress_callback('processing', 0, len(all_files), 
-                                f'Processing {len(all_files)} files with {self.max_workers} workers...')
+                progress_callback('processing', 0, total_files, 
+                                f'Processing {total_files} files with {processing_workers} workers...')
             
-            all_metadata = []
+            extracted_count = 0
             errors = []
             processed_count = 0
             
-            if self.max_workers == 1:
-                for file in all_files:
+            if processing_workers == 1:
+                next_report = 0.0
+                while pending_files:
+                    file = pending_files.popleft()
                     try:
                         metadata = self._process_file(file)
-                        if metadata:
-                            all_metadata.append(metadata)
-                        else:
-                            errors.append(file.get('id', 'unknown'))
-                        processed_count += 1
-                        
-                        if progress_callback:
-                            progress_callback('processing', processed_count, len(all_files),
-                                            f'Processed {processed_count}/{len(all_files)} files...')
-                        
-                        if processed_count % 50 == 0:
-                            import gc
-                            gc.collect()
                     except Exception as e:
+                        metadata = None
+                    processed_count += 1
+                    
+                    if metadata:
+                        extracted_count += 1
+                        yield metadata
+                    else:
                         errors.append(file.get('id', 'unknown'))
-                        processed_count += 1
-                        if progress_callback:
-                            progress_callback('processing', processed_count, len(all_files),
-                                            f'Processed {processed_count}/{len(all_files)} files...')
+                    
+                    if progress_callback:
+                        now = time.monotonic()
+                        if now >= next_report or not pending_files:
+                            next_report = now + PROGRESS_INTERVAL
+                            progress_callback('processing', processed_count, total_files,
+                                            f'Processed {processed_count}/{total_files} files...')
             else:
-                metadata_lock = Lock()
-                batch_size = min(10, len(all_files))
+                chunk_size = max(1, min(PROCESS_CHUNK_SIZE, -(-total_files // self.max_workers)))
                 
-                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    for batch_start in range(0, len(all_files), batch_size):
-                        batch = all_files[batch_start:batch_start + batch_size]
-                        
-                        future_to_file = {}
-                        for file in batch:
+                with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_process_worker) as executor:
+                    in_flight = deque()
+                    while pending_files or in_flight:
+                        while pending_files and len(in_flight) < PROCESS_CHUNKS_IN_FLIGHT * self.max_workers:
+                            chunk = [pending_files.popleft() for _ in range(min(chunk_size, len(pending_files)))]
                             try:
-                                future = executor.submit(self._process_file, file)
-                                future_to_file[future] = file
+                                in_flight.append((chunk, executor.submit(_process_files_in_worker, chunk)))
                             except Exception as e:
-                                errors.append(file.get('id', 'unknown'))
-                                processed_count += 1
+                                errors.extend(file.get('id', 'unknown') for file in chunk)
+                                processed_count += len(chunk)
                         
-                        for future in as_completed(future_to_file):
-                            file = future_to_file[future]
-                            try:
-                                metadata = future.result(timeout=60)
-                                if metadata:
-                                    with metadata_lock:
-                                        all_metadata.append(metadata)
-                                    processed_count += 1
-                                else:
-                                    errors.append(file.get('id', 'unknown'))
-                                    processed_count += 1
-                                
-                                if progress_callback:
-                                    progress_callback('processing', processed_count, len(all_files),
-                                                    f'Processed {processed_count}/{len(all_files)} files...')
-                                
-                            except Exception as e:
+                        if not in_flight:
+                            continue
+                        
+                        chunk, future = in_flight.popleft()
+                        try:
+                            results = future.result(timeout=60)
+                        except Exception as e:
+                            results = [None] * len(chunk)
+                        
+                        for file, metadata in zip(chunk, results):
+                            processed_count += 1
+                            if metadata:
+                                extracted_count += 1
+                                yield metadata
+                            else:
                                 errors.append(file.get('id', 'unknown'))
-                                processed_count += 1
-                                if progress_callback:
-                                    progress_callback('processing', processed_count, len(all_files),
-                                                    f'Processed {processed_count}/{len(all_files)} files...')
                         
-                        del future_to_file
-                        import gc
-                        gc.collect()
+                        if progress_callback:
+                            progress_callback('processing', processed_count, total_files,
+                                            f'Processed {processed_count}/{total_files} files...')
             
             if progress_callback:
-                progress_callback('completed', len(all_metadata), len(all_files),
-                                f'Successfully extracted {len(all_metadata)} files!')
-            
-            return all_metadata
+                progress_callback('completed', extracted_count, total_files,
+                                f'Successfully extracted {extracted_count} files!')
             
         except Exception as e:
             if progress_callback:
                 progress_callback('error', 0, 0, f'Error: {str(e)}')
             raise
+
+_worker_extractor = None
+
+
+def _init_process_worker():
+    """
+    Initializes a worker process for the 'process' backend.
+    File processing only formats data already returned by files.list,
+    so the worker extractor does not need its own Drive service.
+    """
+    global _worker_extractor
+    _worker_extractor = MetadataExtractor(None)
+
+
+def _process_files_in_worker(files: List[Dict]) -> List[Optional[Dict]]:
+    """Process a chunk of files inside a worker process"""
+    return _worker_extractor._process_files(files)
@@ -10,6 +10,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from auth import authenticate
 
+FOLDER_PATH_RE = re.compile(r'/drive/folders/([a-zA-Z0-9_-]+)')
+OPEN_ID_RE = re.compile(r'/open\?id=([a-zA-Z0-9_-]+)')
+QUERY_ID_RE = re.compile(r'[?&]id=([a-zA-Z0-9_-]+)')
+
 
 def extract_folder_id_from_url(url_or_id: str) -> Optional[str]:
     """
@@ -36,20 +40,10 @@ def extract_folder_id_from_url(url_or_id: str) -> Optional[str]:
     if not url_or_id.startswith('http') and '/' not in url_or_id and '?' not in url_or_id:
         return url_or_id
     
-    pattern1 = r'/drive/folders/([a-zA-Z0-9_-]+)'
-    match = re.search(pattern1, url_or_id)
-    if match:
-        return match.group(1)
-    
-    pattern2 = r'/open\?id=([a-zA-Z0-9_-]+)'
-    match = re.search(pattern2, url_or_id)
-    if match:
-        return match.group(1)
-    
-    pattern3 = r'[?&]id=([a-zA-Z0-9_-]+)'
-    match = re.search(pattern3, url_or_id)
-    if match:
-        return match.group(1)
+    for pattern in (FOLDER_PATH_RE, OPEN_ID_RE, QUERY_ID_RE):
+        match = pattern.search(url_or_id)
+        if match:
+            return match.group(1)
     
     return None
 
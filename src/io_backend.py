@@ -0,0 +1,136 @@
+"""
+Background disk writer for exporter output
+"""
+import io
+import os
+import queue
+import threading
+
+WRITE_BATCH_SIZE = 32
+QUEUE_MAX_CHUNKS = 256
+
+
+class BackgroundWriter(io.RawIOBase):
+    """
+    Raw binary file whose writes are performed by a background thread.
+    
+    write() only enqueues the data and returns immediately, so the caller
+    keeps producing output while earlier chunks are flushed to disk. The
+    writer thread drains up to WRITE_BATCH_SIZE queued chunks at a time and
+    submits them with a single os.writev() call where the platform has it.
+    """
+    
+    def __init__(self, path):
+        """
+        Args:
+            path: Path of the file to create (truncated if it exists)
+        """
+        super().__init__()
+        self.path = path
+        self.fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        self.chunks = queue.Queue(maxsize=QUEUE_MAX_CHUNKS)
+        self.error = None
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+    
+    def writable(self):
+        return True
+    
+    def write(self, data) -> int:
+        """
+        Queues bytes to be written.
+        
+        Args:
+            data: Bytes-like object
+        
+        Returns:
+            Number of bytes accepted
+        """
+        if self.error is not None:
+            raise self.error
+        chunk = bytes(data)
+        if chunk:
+            self.chunks.put(chunk)
+        return len(chunk)
+    
+    def close(self):
+        """Waits for all queued data to reach the file, then closes it"""
+        if self.closed:
+            return
+        self.chunks.put(None)
+        self.thread.join()
+        os.close(self.fd)
+        super().close()
+        if self.error is not None:
+            raise self.error
+    
+    def _drain(self):
+        """Writer thread: writes queued chunks in batches until closed"""
+        while True:
+            batch = [self.chunks.get()]
+            while batch[-1] is not None and len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self.chunks.get_nowait())
+                except queue.Empty:
+                    break
+            
+            done = batch[-1] is None
+            if done:
+                batch.pop()
+            
+            if batch and self.error is None:
+                try:
+                    self._write_all(batch)
+                except OSError as e:
+                    self.error = e
+            
+            if done:
+                return
+    
+    def _write_all(self, batch):
+        if not hasattr(os, 'writev'):
+            for chunk in batch:
+                view = memoryview(chunk)
+                while view:
+                    view = view[os.write(self.fd, view):]
+            return
+        
+        while batch:
+            written = os.writev(self.fd, batch)
+            while batch and written >= len(batch[0]):
+                written -= len(batch[0])
+                batch.pop(0)
+            if batch and written:
+                batch[0] = batch[0][written:]
+
+
+def open_text(path, buffer_size: int = 1024 * 1024):
+    """
+    Opens a UTF-8 text stream backed by a BackgroundWriter.
+    
+    Args:
+        path: Path of the file to create
+        buffer_size: Size of the in-memory buffer coalescing small writes
+    
+    Returns:
+        io.TextIOWrapper suitable for csv.writer (newline translation disabled)
+    """
+    return io.TextIOWrapper(
+        io.BufferedWriter(BackgroundWriter(path), buffer_size=buffer_size),
+        encoding='utf-8',
+        newline=''
+    )
+
+
+def open_binary(path, buffer_size: int = 1024 * 1024):
+    """
+    Opens a binary stream backed by a BackgroundWriter.
+    
+    Args:
+        path: Path of the file to create
+        buffer_size: Size of the in-memory buffer coalescing small writes
+    
+    Returns:
+        io.BufferedWriter
+    """
+    return io.BufferedWriter(BackgroundWriter(path), buffer_size=buffer_size)
@@ -0,0 +1,119 @@
+"""
+HTTP/2 transport for the Google Drive API client
+"""
+import threading
+
+import httplib2
+from googleapiclient.http import build_http
+
+try:
+    import httpx
+    import h2  # noqa: F401 - required by httpx for HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class Http2Transport:
+    """
+    httplib2-compatible transport backed by a pooled httpx HTTP/2 client.
+    
+    googleapiclient only needs the request() method of httplib2.Http, so this
+    class can be passed wherever an httplib2.Http object is expected. All
+    requests share one connection pool and are multiplexed over HTTP/2.
+    """
+    
+    def __init__(self, timeout: float = 60.0, max_connections: int = 64):
+        """
+        Args:
+            timeout: Timeout in seconds for each request
+            max_connections: Maximum number of pooled keep-alive connections
+        """
+        self.timeout = timeout
+        self.client = httpx.Client(
+            http2=True,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+    
+    def request(self, uri, method='GET', body=None, headers=None,
+                redirections=httplib2.DEFAULT_MAX_REDIRECTS, connection_type=None, **kwargs):
+        """
+        Performs a request and returns it in httplib2's (response, content) form.
+        
+        Args:
+            uri: Absolute request URI
+            method: HTTP method
+            body: Request body (str, bytes or None)
+            headers: Request headers
+        
+        Returns:
+            Tuple of (httplib2.Response, bytes)
+        
+        Raises:
+            TimeoutError: If the request timed out
+            ConnectionError: If the connection or HTTP/2 stream was dropped
+        """
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        
+        # Raised as the socket errors httplib2 would raise, so callers retry them alike
+        try:
+            response = self.client.request(method, uri, content=body, headers=headers)
+        except httpx.TimeoutException as error:
+            raise TimeoutError(f"{type(error).__name__}: {error}") from error
+        except (httpx.NetworkError, httpx.RemoteProtocolError) as error:
+            raise ConnectionError(f"{type(error).__name__}: {error}") from error
+        
+        info = {key: value for key, value in response.headers.items()
+                if key.lower() != 'content-encoding'}
+        info['status'] = str(response.status_code)
+        return httplib2.Response(info), response.content
+    
+    def close(self):
+        """Closes all pooled connections"""
+        self.client.close()
+
+
+class ThreadLocalHttp:
+    """
+    httplib2-compatible transport that gives each thread its own httplib2.Http.
+    
+    httplib2.Http is not thread-safe, so a single instance shared by parallel
+    workers can corrupt responses. Each thread lazily builds its own
+    keep-alive connection with googleapiclient's defaults and reuses it for
+    every later request.
+    """
+    
+    def __init__(self):
+        self.local = threading.local()
+    
+    @property
+    def http(self) -> httplib2.Http:
+        """The calling thread's httplib2.Http instance"""
+        http = getattr(self.local, 'http', None)
+        if http is None:
+            http = self.local.http = build_http()
+        return http
+    
+    @property
+    def timeout(self):
+        return self.http.timeout
+    
+    @property
+    def redirect_codes(self):
+        return self.http.redirect_codes
+    
+    def request(self, *args, **kwargs):
+        """Performs a request on the calling thread's connection"""
+        return self.http.request(*args, **kwargs)
+    
+    def close(self):
+        """Closes the calling thread's connections"""
+        http = getattr(self.local, 'http', None)
+        if http is not None:
+            http.close()
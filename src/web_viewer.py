@@ -2,14 +2,27 @@
 Web viewer server for displaying extraction results
 """
 import json
+import mmap
+import re
+import zlib
 import hashlib
 from pathlib import Path
 from datetime import datetime
-from flask import Flask, render_template_string, jsonify
-from typing import List, Dict
+from flask import Flask, Response, request, render_template
+from werkzeug.serving import make_server
+from typing import List, Dict, Optional, Tuple
 import webbrowser
 import threading
-import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import waitress
+except ImportError:
+    waitress = None
 
 
 HTML_TEMPLATE = """
@@ -149,6 +162,16 @@ HTML_TEMPLATE = """
             border-collapse: collapse;
         }
         
+        #data-table {
+            table-layout: fixed;
+        }
+        
+        #data-table td {
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+        }
+        
         thead {
             background: black;
             color: white;
@@ -195,6 +218,18 @@ HTML_TEMPLATE = """
             background: #e0e0e0;
         }
         
+        tbody tr.spacer-row {
+            border-bottom: none;
+        }
+        
+        tbody tr.spacer-row:hover {
+            background: none;
+        }
+        
+        tr.spacer-row td {
+            padding: 0;
+        }
+        
         td {
             padding: 12px 15px;
             font-size: 0.9em;
@@ -303,12 +338,14 @@ HTML_TEMPLATE = """
                     <label>File Type</label>
                     <select id="filter-type">
                         <option value="">All Types</option>
+                        {% for type in types %}<option value="{{ type }}">{{ type }}</option>{% endfor %}
                     </select>
                 </div>
                 <div class="filter-group">
                     <label>Owner</label>
                     <select id="filter-owner">
                         <option value="">All Owners</option>
+                        {% for owner in owners %}<option value="{{ owner }}">{{ owner }}</option>{% endfor %}
                     </select>
                 </div>
                 <div class="filter-group">
@@ -324,6 +361,16 @@ HTML_TEMPLATE = """
         
         <div class="table-container">
             <table id="data-table">
+                <colgroup>
+                    <col style="width: 20%">
+                    <col style="width: 10%">
+                    <col style="width: 15%">
+                    <col style="width: 15%">
+                    <col style="width: 8%">
+                    <col style="width: 12%">
+                    <col style="width: 14%">
+                    <col style="width: 6%">
+                </colgroup>
                 <thead>
                     <tr>
                         <th class="sortable" data-column="name">Name</th>
@@ -352,16 +399,30 @@ HTML_TEMPLATE = """
         </div>
     </div>
     
+    <template id="row-template">
+        <tr>
+            <td><strong></strong></td>
+            <td><span class="file-type"></span></td>
+            <td class="date-cell"></td>
+            <td class="date-cell"></td>
+            <td class="size-cell"></td>
+            <td></td>
+            <td></td>
+            <td class="link-cell"></td>
+        </tr>
+    </template>
+    
     <!-- Store JSON data in a script tag to avoid HTML entity encoding issues -->
-    <script id="metadata-data" type="application/json">{{ data|tojson|safe }}</script>
+    <script id="metadata-data" type="application/json">{% if data_json is defined %}{{ data_json|safe }}{% else %}{{ data|tojson|safe }}{% endif %}</script>
     
     <script>
+        const DEBUG = {{ debug|default(false)|tojson }};
         let allData = [];
         try {
             const dataScript = document.getElementById('metadata-data');
             if (dataScript) {
                 const dataString = dataScript.textContent;
-                console.log('Data string length:', dataString.length);
+                if (DEBUG) console.log('Data string length:', dataString.length);
                 allData = JSON.parse(dataString);
             } else {
                 console.error('metadata-data script tag not found!');
@@ -380,41 +441,67 @@ HTML_TEMPLATE = """
             allData = [];
         }
         
-        console.log('Loaded', allData.length, 'files');
-        if (allData.length > 0) {
-            console.log('First file keys:', Object.keys(allData[0]));
-            console.log('First file name:', allData[0].name);
-            console.log('First file sample:', JSON.stringify(allData[0]).substring(0, 300));
-        } else {
+        if (DEBUG) {
+            console.log('Loaded', allData.length, 'files');
+            if (allData.length > 0) {
+                console.log('First file keys:', Object.keys(allData[0]));
+                console.log('First file name:', allData[0].name);
+                console.log('First file sample:', JSON.stringify(allData[0]).substring(0, 300));
+            }
+        }
+        if (allData.length === 0) {
             console.warn('No files loaded! Check console for errors above.');
             console.warn('Total files from server:', {{ total_files }});
         }
         
-        let filteredData = [...allData];
-        let sortColumn = 'creation_date';
-        let sortDirection = 'desc';
+        // YYYY-MM-DD[...] -> YYYYMMDD, so date filters compare integers
+        function dayNumber(date) {
+            if (!date) return 0;
+            return +date.slice(0, 4) * 10000 + +date.slice(5, 7) * 100 + +date.slice(8, 10);
+        }
         
-        function initFilters() {
-            const types = [...new Set(allData.map(f => f.file_type))].sort();
-            const owners = [...new Set(allData.map(f => f.owner_email))].sort();
-            
-            const typeSelect = document.getElementById('filter-type');
-            types.forEach(type => {
-                const option = document.createElement('option');
-                option.value = type;
-                option.textContent = type;
-                typeSelect.appendChild(option);
-            });
+        // Values that filtering and sorting scan are kept in flat per-column
+        // arrays indexed like allData, and row selections are typed arrays of
+        // those indices, so the records themselves are only read for display.
+        const rowCount = allData.length;
+        const searchText = new Array(rowCount);
+        const fileTypes = new Array(rowCount);
+        const ownerEmails = new Array(rowCount);
+        const typeClasses = new Array(rowCount);
+        const createdDays = new Int32Array(rowCount);
+        const createdTimes = new Float64Array(rowCount);
+        const sizes = new Float64Array(rowCount);
+        const allRows = new Uint32Array(rowCount);
+        
+        const typeClassByType = new Map();
+        for (let i = 0; i < rowCount; i++) {
+            const file = allData[i];
+            searchText[i] = (file.name + '\\n' + file.file_type + '\\n' +
+                             file.owner_email + '\\n' + file.full_path).toLowerCase();
+            fileTypes[i] = file.file_type;
+            ownerEmails[i] = file.owner_email;
             
-            const ownerSelect = document.getElementById('filter-owner');
-            owners.forEach(owner => {
-                const option = document.createElement('option');
-                option.value = owner;
-                option.textContent = owner;
-                ownerSelect.appendChild(option);
-            });
+            let typeClass = typeClassByType.get(file.file_type);
+            if (typeClass === undefined) {
+                typeClass = `file-type ${getTypeClass(file.file_type)}`;
+                typeClassByType.set(file.file_type, typeClass);
+            }
+            typeClasses[i] = typeClass;
+            createdDays[i] = dayNumber(file.creation_date_raw);
+            const createdTime = Date.parse(file.creation_date_raw);
+            createdTimes[i] = Number.isNaN(createdTime) ? -Infinity : createdTime;
+            sizes[i] = parseInt(file.size_bytes) || 0;
+            allRows[i] = i;
         }
         
+        let matchedRows = allRows;
+        let sortedRows = allRows;
+        let lastSearch = '';
+        let lastFilterKey = null;
+        const sortCache = new Map();
+        let sortColumn = 'creation_date';
+        let sortDirection = 'desc';
+        
         function applyFilters() {
             const searchTerm = document.getElementById('search-box').value.toLowerCase();
             const typeFilter = document.getElementById('filter-type').value;
@@ -422,65 +509,86 @@ HTML_TEMPLATE = """
             const dateFrom = document.getElementById('filter-date-from').value;
             const dateTo = document.getElementById('filter-date-to').value;
             
-            filteredData = allData.filter(file => {
-                const matchesSearch = !searchTerm || 
-                    file.name.toLowerCase().includes(searchTerm) ||
-                    file.file_type.toLowerCase().includes(searchTerm) ||
-                    file.owner_email.toLowerCase().includes(searchTerm) ||
-                    file.full_path.toLowerCase().includes(searchTerm);
-                
-                const matchesType = !typeFilter || file.file_type === typeFilter;
-                const matchesOwner = !ownerFilter || file.owner_email === ownerFilter;
-                
-                let matchesDate = true;
-                if (dateFrom || dateTo) {
-                    const createdDate = file.creation_date_raw ? file.creation_date_raw.split('T')[0] : '';
-                    if (dateFrom && createdDate < dateFrom) matchesDate = false;
-                    if (dateTo && createdDate > dateTo) matchesDate = false;
-                }
-                
-                return matchesSearch && matchesType && matchesOwner && matchesDate;
-            });
+            const filterKey = JSON.stringify([typeFilter, ownerFilter, dateFrom, dateTo]);
+            if (filterKey === lastFilterKey && searchTerm === lastSearch) {
+                return;
+            }
+            
+            // A longer search term can only narrow the previous result
+            const source = filterKey === lastFilterKey && searchTerm.startsWith(lastSearch) ? matchedRows : allRows;
+            lastFilterKey = filterKey;
+            lastSearch = searchTerm;
+            sortCache.clear();
+            
+            const dayFrom = dayNumber(dateFrom);
+            const dayTo = dayNumber(dateTo);
+            
+            const matches = new Uint32Array(source.length);
+            let count = 0;
+            for (let k = 0; k < source.length; k++) {
+                const i = source[k];
+                if (searchTerm && !searchText[i].includes(searchTerm)) continue;
+                if (typeFilter && fileTypes[i] !== typeFilter) continue;
+                if (ownerFilter && ownerEmails[i] !== ownerFilter) continue;
+                if (dayFrom && createdDays[i] < dayFrom) continue;
+                if (dayTo && createdDays[i] > dayTo) continue;
+                matches[count++] = i;
+            }
+            matchedRows = matches.subarray(0, count);
             
             sortData();
             renderTable();
         }
         
+        function getSortKey(i, column) {
+            if (column === 'size_formatted') {
+                return sizes[i];
+            }
+            if (column.includes('date')) {
+                return createdTimes[i];
+            }
+            
+            const value = allData[i][column] || '';
+            return typeof value === 'string' ? value.toLowerCase() : value;
+        }
+        
         function sortData() {
-            filteredData.sort((a, b) => {
-                let aVal = a[sortColumn] || '';
-                let bVal = b[sortColumn] || '';
-                
-                if (sortColumn.includes('date')) {
-                    aVal = a.creation_date_raw || '';
-                    bVal = b.creation_date_raw || '';
-                }
-                
-                if (sortColumn === 'size_formatted') {
-                    const aSize = parseInt(a.size_bytes) || 0;
-                    const bSize = parseInt(b.size_bytes) || 0;
-                    return sortDirection === 'asc' ? aSize - bSize : bSize - aSize;
-                }
-                
-                if (typeof aVal === 'string') {
-                    aVal = aVal.toLowerCase();
-                    bVal = bVal.toLowerCase();
-                }
-                
-                if (sortDirection === 'asc') {
-                    return aVal > bVal ? 1 : aVal < bVal ? -1 : 0;
-                } else {
-                    return aVal < bVal ? 1 : aVal > bVal ? -1 : 0;
-                }
-            });
+            let order = sortCache.get(sortColumn);
+            if (!order) {
+                const keys = Array.from(matchedRows, i => getSortKey(i, sortColumn));
+                const positions = keys.map((_, k) => k).sort((a, b) => {
+                    const aKey = keys[a];
+                    const bKey = keys[b];
+                    return aKey > bKey ? 1 : aKey < bKey ? -1 : 0;
+                });
+                order = Uint32Array.from(positions, k => matchedRows[k]);
+                sortCache.set(sortColumn, order);
+            }
+            
+            sortedRows = sortDirection === 'desc' ? order.slice().reverse() : order;
         }
         
+        // Only the rows around the visible part of the table are in the DOM;
+        // spacer rows stand in for the rest so the scrollbar stays accurate.
+        // Row elements are cloned from #row-template once and then reused,
+        // with their cells updated through textContent.
+        const VIRTUAL_OVERSCAN = 20;
+        const DEFAULT_ROW_HEIGHT = 45;
+        const SEARCH_DEBOUNCE_MS = 150;
+        const rowTemplate = document.getElementById('row-template').content.firstElementChild;
+        const rowPool = [];
+        const topSpacer = createSpacerRow();
+        const bottomSpacer = createSpacerRow();
+        let mountedRows = 0;
+        let rowHeight = 0;
+        let renderedStart = -1;
+        let renderedEnd = -1;
+        let renderScheduled = false;
+        
         function renderTable() {
             const tbody = document.getElementById('table-body');
             const countEl = document.getElementById('filtered-count');
             
-            console.log('renderTable called with', filteredData.length, 'files');
-            
             if (!tbody) {
                 console.error('table-body element not found!');
                 return;
@@ -491,37 +599,119 @@ HTML_TEMPLATE = """
                 return;
             }
             
-            countEl.textContent = filteredData.length;
+            countEl.textContent = sortedRows.length;
+            renderedStart = -1;
+            renderedEnd = -1;
             
-            if (filteredData.length === 0) {
-                console.warn('No files to display');
+            if (sortedRows.length === 0) {
                 tbody.innerHTML = '<tr><td colspan="8" class="no-results">No files match the current filters</td></tr>';
+                mountedRows = 0;
                 return;
             }
             
-            console.log('Rendering', filteredData.length, 'files to table');
-            const tableHTML = filteredData.map(file => {
-                const typeClass = getTypeClass(file.file_type);
-                return `
-                    <tr>
-                        <td><strong>${escapeHtml(file.name || 'N/A')}</strong></td>
-                        <td><span class="file-type ${typeClass}">${escapeHtml(file.file_type || 'N/A')}</span></td>
-                        <td class="date-cell">${escapeHtml(file.creation_date || 'N/A')}</td>
-                        <td class="date-cell">${escapeHtml(file.modification_date || 'N/A')}</td>
-                        <td class="size-cell">${escapeHtml(file.size_formatted || 'N/A')}</td>
-                        <td>${escapeHtml(file.owner_name || file.owner_email || 'N/A')}</td>
-                        <td style="max-width: 300px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;" title="${escapeHtml(file.full_path || 'N/A')}">${escapeHtml(file.full_path || 'N/A')}</td>
-                        <td class="link-cell">${file.share_link && file.share_link !== 'N/A' ? `<a href="${escapeHtml(file.share_link)}" target="_blank">Open</a>` : 'N/A'}</td>
-                    </tr>
-                `;
-            }).join('');
+            renderWindow();
+        }
+        
+        function renderWindow() {
+            const container = document.querySelector('.table-container');
+            const tbody = document.getElementById('table-body');
+            const total = sortedRows.length;
+            if (!container || !tbody || total === 0) return;
+            
+            const height = rowHeight || DEFAULT_ROW_HEIGHT;
+            const headerHeight = document.querySelector('#data-table thead').offsetHeight;
+            const visibleRows = Math.ceil(container.clientHeight / height) + 1;
+            const firstVisible = Math.floor(Math.max(0, container.scrollTop - headerHeight) / height);
+            const start = Math.max(0, Math.min(firstVisible, total - visibleRows) - VIRTUAL_OVERSCAN);
+            const end = Math.min(total, firstVisible + visibleRows + VIRTUAL_OVERSCAN);
+            
+            if (start === renderedStart && end === renderedEnd) return;
+            renderedStart = start;
+            renderedEnd = end;
             
-            console.log('Generated table HTML length:', tableHTML.length);
-            console.log('First 500 chars of table HTML:', tableHTML.substring(0, 500));
+            const count = end - start;
+            while (rowPool.length < count) {
+                rowPool.push(rowTemplate.cloneNode(true));
+            }
+            for (let i = 0; i < count; i++) {
+                fillRow(rowPool[i], sortedRows[start + i]);
+            }
+            setSpacerHeight(topSpacer, start * height);
+            setSpacerHeight(bottomSpacer, (total - end) * height);
             
-            tbody.innerHTML = tableHTML;
+            if (mountedRows !== count) {
+                const fragment = document.createDocumentFragment();
+                fragment.appendChild(topSpacer);
+                for (let i = 0; i < count; i++) {
+                    fragment.appendChild(rowPool[i]);
+                }
+                fragment.appendChild(bottomSpacer);
+                tbody.replaceChildren(fragment);
+                mountedRows = count;
+            }
             
-            console.log('Table rendered. tbody children:', tbody.children.length);
+            if (!rowHeight && count > 1) {
+                const measured = rowPool[1].offsetTop - rowPool[0].offsetTop;
+                if (measured > 0) {
+                    rowHeight = measured;
+                    renderedStart = -1;
+                    renderWindow();
+                }
+            }
+        }
+        
+        function scheduleRenderWindow() {
+            if (renderScheduled) return;
+            renderScheduled = true;
+            requestAnimationFrame(() => {
+                renderScheduled = false;
+                renderWindow();
+            });
+        }
+        
+        function createSpacerRow() {
+            const row = document.createElement('tr');
+            row.className = 'spacer-row';
+            const cell = document.createElement('td');
+            cell.colSpan = 8;
+            row.appendChild(cell);
+            return row;
+        }
+        
+        function setSpacerHeight(row, height) {
+            row.style.display = height > 0 ? '' : 'none';
+            row.firstElementChild.style.height = `${height}px`;
+        }
+        
+        function fillRow(row, index) {
+            const file = allData[index];
+            const cells = row.cells;
+            cells[0].firstElementChild.textContent = file.name || 'N/A';
+            
+            const typeBadge = cells[1].firstElementChild;
+            typeBadge.className = typeClasses[index];
+            typeBadge.textContent = file.file_type || 'N/A';
+            
+            cells[2].textContent = file.creation_date || 'N/A';
+            cells[3].textContent = file.modification_date || 'N/A';
+            cells[4].textContent = file.size_formatted || 'N/A';
+            cells[5].textContent = file.owner_name || file.owner_email || 'N/A';
+            cells[6].textContent = file.full_path || 'N/A';
+            cells[6].title = file.full_path || 'N/A';
+            
+            const linkCell = cells[7];
+            if (file.share_link && file.share_link !== 'N/A') {
+                let link = linkCell.firstElementChild;
+                if (!link) {
+                    link = document.createElement('a');
+                    link.target = '_blank';
+                    link.textContent = 'Open';
+                    linkCell.replaceChildren(link);
+                }
+                link.href = file.share_link;
+            } else {
+                linkCell.textContent = 'N/A';
+            }
         }
         
         function getTypeClass(type) {
@@ -535,14 +725,14 @@ HTML_TEMPLATE = """
             return 'type-other';
         }
         
-        function escapeHtml(text) {
-            if (!text) return '';
-            const div = document.createElement('div');
-            div.textContent = text;
-            return div.innerHTML;
-        }
+        document.querySelector('.table-container').addEventListener('scroll', scheduleRenderWindow, { passive: true });
+        window.addEventListener('resize', scheduleRenderWindow);
         
-        document.getElementById('search-box').addEventListener('input', applyFilters);
+        let searchTimer = null;
+        document.getElementById('search-box').addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(applyFilters, SEARCH_DEBOUNCE_MS);
+        });
         document.getElementById('filter-type').addEventListener('change', applyFilters);
         document.getElementById('filter-owner').addEventListener('change', applyFilters);
         document.getElementById('filter-date-from').addEventListener('change', applyFilters);
@@ -570,7 +760,6 @@ HTML_TEMPLATE = """
         });
         
         if (allData.length > 0) {
-            initFilters();
             sortData();
             renderTable();
             
@@ -593,6 +782,9 @@ HTML_TEMPLATE = """
 """
 
 
+HASH_CHUNK_SIZE = 256 * 1024
+
+
 def calculate_file_hash(file_path: Path) -> str:
     """
     Calculate SHA-256 hash of a file for forensic integrity.
@@ -603,63 +795,439 @@ def calculate_file_hash(file_path: Path) -> str:
     Returns:
         SHA-256 hash as hexadecimal string
     """
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        
+        sha256_hash = hashlib.sha256()
+        buffer = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            sha256_hash.update(view[:read])
     return sha256_hash.hexdigest()
 
 
+FILES_ARRAY_MARKER = b'\n  "files": '
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+COMPRESS_MIMETYPES = ('text/html', 'application/json')
+COMPRESS_LEVEL = 5
+COMPRESS_MIN_SIZE = 2048
+
+
+def gzip_chunks(chunks, level: int = COMPRESS_LEVEL):
+    """
+    Gzip-compresses a stream of byte chunks.
+    
+    Args:
+        chunks: Iterable of bytes
+        level: zlib compression level
+    
+    Yields:
+        Compressed bytes forming a single gzip member
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def compress_response(response: Response) -> Response:
+    """
+    after_request hook that gzip-compresses HTML and JSON responses for
+    clients that accept it. The embedded metadata compresses well, so this
+    shrinks the page several times over. Streamed responses are compressed
+    chunk by chunk; file responses (send_file) are passed through untouched.
+    
+    Args:
+        response: Response returned by a route
+    
+    Returns:
+        The same response, compressed when applicable
+    """
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or request.accept_encodings.quality('gzip') <= 0):
+        return response
+    
+    if response.is_streamed:
+        response.response = gzip_chunks(response.response)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(b''.join(gzip_chunks((data,))))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def find_files_array(export: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Locates the "files" array inside a JSON export written by JSONExporter.
+    
+    Args:
+        export: Bytes (or mmap) of the JSON export
+    
+    Returns:
+        (start, end) byte offsets of the array, or None if the layout is not recognized
+    """
+    marker = export.find(FILES_ARRAY_MARKER)
+    end = export.rfind(b']')
+    if marker == -1 or end == -1:
+        return None
+    start = marker + len(FILES_ARRAY_MARKER)
+    if export[start:start + 1] != b'[' or end < start:
+        return None
+    return start, end + 1
+
+
+def read_export_header(export: bytes, files_span: Tuple[int, int]) -> Dict:
+    """
+    Parses the extraction_metadata section that precedes the "files" array.
+    
+    Args:
+        export: Bytes (or mmap) of the JSON export
+        files_span: Offsets returned by find_files_array
+    
+    Returns:
+        The extraction_metadata dictionary (empty if absent)
+    """
+    header = export[:files_span[0] - len(FILES_ARRAY_MARKER)].rstrip().rstrip(b',')
+    return json.loads(header + b'}').get('extraction_metadata', {})
+
+
+FACET_FIELDS = ('file_type', 'owner_email')
+VIEWER_FIELDS = (
+    'name', 'file_type', 'creation_date', 'creation_date_raw', 'modification_date',
+    'size_formatted', 'size_bytes', 'owner_name', 'owner_email', 'full_path', 'share_link'
+)
+
+
+def viewer_rows(metadata: List[Dict]) -> List[Dict]:
+    """
+    Projects metadata onto the fields the viewer table displays, filters
+    and sorts on, so the page does not embed the columns it never reads.
+    
+    Args:
+        metadata: List of metadata dictionaries
+    
+    Returns:
+        List of dictionaries holding only VIEWER_FIELDS
+    """
+    return [{field: file[field] for field in VIEWER_FIELDS if field in file}
+            for file in metadata]
+
+
+def collect_facets(metadata: List[Dict]) -> Dict[str, List[str]]:
+    """
+    Collects the sorted distinct values of the viewer's filter fields.
+    
+    Args:
+        metadata: List of metadata dictionaries
+    
+    Returns:
+        Dictionary mapping each field in FACET_FIELDS to its sorted values
+    """
+    return {field: sorted({str(file.get(field, '')) for file in metadata})
+            for field in FACET_FIELDS}
+
+
+def scan_export_facets(export: bytes, files_span: Tuple[int, int]) -> Dict[str, List[str]]:
+    """
+    Collects the filter facets straight from the bytes of a JSON export.
+    Keys are matched only at the start of a line, where they cannot be part
+    of a string value, and only the distinct raw values are decoded.
+    
+    Args:
+        export: Bytes (or mmap) of the JSON export
+        files_span: Offsets returned by find_files_array
+    
+    Returns:
+        Dictionary mapping each field in FACET_FIELDS to its sorted values
+    """
+    start, end = files_span
+    facets = {}
+    for field in FACET_FIELDS:
+        pattern = re.compile(rb'\n[ \t]*"' + field.encode() + rb'": ("(?:[^"\\]|\\.)*")')
+        raw_values = set(pattern.findall(export, start, end))
+        facets[field] = sorted({json.loads(raw) for raw in raw_values})
+    return facets
+
+
+def serialize_metadata(metadata: List[Dict]) -> bytes:
+    """
+    Serializes metadata to compact UTF-8 JSON, using orjson when available.
+    
+    Args:
+        metadata: List of metadata dictionaries
+    
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(metadata)
+        except TypeError:
+            pass
+    return json.dumps(metadata, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def html_safe_json(raw: bytes) -> str:
+    """
+    Makes serialized JSON safe to embed in a <script> tag without re-encoding it.
+    The escaped characters can only occur inside JSON strings, where \\uXXXX
+    escapes are equivalent, so the parsed value is unchanged.
+    
+    Args:
+        raw: Serialized JSON bytes
+    
+    Returns:
+        JSON text with <, >, & and ' escaped
+    """
+    return (raw.replace(b'<', b'\\u003c')
+               .replace(b'>', b'\\u003e')
+               .replace(b'&', b'\\u0026')
+               .replace(b"'", b'\\u0027')
+               .decode('utf-8'))
+
+
+SERVER_THREADS = 4
+
+
+def serve(app: Flask, port: int, open_browser: bool = True, threads: int = SERVER_THREADS):
+    """
+    Serves a Flask app on localhost until interrupted, using waitress's
+    thread pool when it is installed and Werkzeug's threaded server
+    otherwise. The listening socket is bound before this opens the browser,
+    so the page loads immediately instead of after a fixed startup delay.
+    
+    Args:
+        app: Flask application to serve
+        port: Local port to listen on
+        open_browser: Whether to open the app in the default browser
+        threads: Size of waitress's worker thread pool
+    """
+    if waitress is not None:
+        run = waitress.create_server(app, host='127.0.0.1', port=port, threads=threads).run
+    else:
+        run = make_server('127.0.0.1', port, app, threaded=True).serve_forever
+    
+    if open_browser:
+        threading.Thread(target=webbrowser.open, args=(f'http://localhost:{port}',), daemon=True).start()
+    
+    try:
+        run()
+    except KeyboardInterrupt:
+        pass
+
+
 class WebViewer:
     """Web viewer for displaying extraction results"""
     
-    def __init__(self, metadata: List[Dict], output_path: str):
+    def __init__(self, metadata: Optional[List[Dict]], output_path: str,
+                 json_path: Optional[Path] = None):
         """
         Args:
-            metadata: List of metadata dictionaries
+            metadata: List of metadata dictionaries (None when json_path is given)
             output_path: Base path for output files
+            json_path: Optional JSON export to serve directly from a memory map
         """
         self.metadata = metadata
         self.output_path = Path(output_path)
+        self.export_map = None
+        self.files_span = None
+        self.export_summary = None
+        self.export_summary_lock = threading.Lock()
+        
+        if json_path is not None:
+            with open(json_path, 'rb') as f:
+                self.export_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.files_span = find_files_array(self.export_map)
+            if self.files_span is None:
+                self.metadata = json.loads(self.export_map[:]).get('files', [])
+                self.export_map = None
+        
+        self.api_payload = None
+        self.viewer_json = None
+        if self.export_map is None:
+            self.viewer_json = serialize_metadata(viewer_rows(self.metadata or []))
+            self.facets = collect_facets(self.metadata or [])
+            self.data_etag = hashlib.sha256(self.viewer_json).hexdigest()
+        else:
+            self.facets = scan_export_facets(self.export_map, self.files_span)
+            stat = Path(json_path).stat()
+            self.data_etag = f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+        
         self.app = Flask(__name__)
+        self.app.after_request(compress_response)
+        self.template = self.app.jinja_env.from_string(HTML_TEMPLATE)
         self.port = 5000
         self.setup_routes()
     
+    @classmethod
+    def from_file(cls, json_path) -> 'WebViewer':
+        """
+        Creates a viewer that serves an existing JSON export without
+        loading it into Python objects.
+        
+        Args:
+            json_path: Path to the JSON export written by JSONExporter
+        
+        Returns:
+            WebViewer instance
+        """
+        json_path = Path(json_path)
+        return cls(None, str(json_path), json_path=json_path)
+    
+    def _read_export_header(self) -> Dict:
+        """
+        Returns the extraction_metadata section of the JSON export, if any.
+        Only the bytes before the "files" array are parsed when the export
+        has the layout written by JSONExporter.
+        """
+        if self.export_map is not None:
+            return read_export_header(self.export_map, self.files_span)
+        
+        json_file = self.output_path.with_suffix('.json')
+        if json_file.exists():
+            with open(json_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as export:
+                files_span = find_files_array(export)
+                if files_span is not None:
+                    return read_export_header(export, files_span)
+                return json.loads(export[:]).get('extraction_metadata', {})
+        return {}
+    
+    def _export_summary(self, json_file: Path) -> Tuple[str, Dict]:
+        """
+        Returns the SHA-256 hash and extraction_metadata section of the JSON
+        export. Both are cached until the file's modification time or size
+        changes, so page reloads neither rehash nor reparse the export.
+        
+        Args:
+            json_file: Path of the JSON export
+        
+        Returns:
+            Tuple of (file hash or "N/A", extraction_metadata dictionary)
+        """
+        try:
+            stat = json_file.stat()
+            key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        
+        summary = self.export_summary
+        if summary is None or summary[0] != key:
+            with self.export_summary_lock:
+                summary = self.export_summary
+                if summary is None or summary[0] != key:
+                    file_hash = calculate_file_hash(json_file) if key is not None else "N/A"
+                    try:
+                        header = self._read_export_header()
+                    except Exception:
+                        header = {}
+                    summary = self.export_summary = (key, file_hash, header)
+        return summary[1], summary[2]
+    
+    def _conditional_response(self, etag: str, build) -> Response:
+        """
+        Answers with 304 Not Modified when the client already holds the
+        version identified by etag, so reloads skip rendering and transfer.
+        The ETag is weak because the body may be sent gzip-compressed.
+        
+        Args:
+            etag: Identifier of the current response content
+            build: Callable returning the full response
+        
+        Returns:
+            Response tagged with the ETag
+        """
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = build()
+        response.set_etag(etag, weak=True)
+        return response
+    
     def setup_routes(self):
         """Setup Flask routes"""
         
         @self.app.route('/')
         def index():
             json_file = self.output_path.with_suffix('.json')
-            file_hash = "N/A"
             extraction_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            total_files = len(self.metadata) if self.metadata is not None else 0
             
-            if json_file.exists():
-                file_hash = calculate_file_hash(json_file)
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        json_data = json.load(f)
-                        if 'extraction_metadata' in json_data and 'date' in json_data['extraction_metadata']:
-                            date_str = json_data['extraction_metadata']['date']
-                            try:
-                                dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                                extraction_date = dt.strftime('%Y-%m-%d %H:%M:%S')
-                            except:
-                                extraction_date = date_str[:19] if len(date_str) > 19 else date_str
-                except:
-                    pass
+            file_hash, header = self._export_summary(json_file)
+            header_date = header.get('date') if isinstance(header, dict) else None
             
-            return render_template_string(
-                HTML_TEMPLATE,
-                data=json.dumps(self.metadata),
-                total_files=len(self.metadata),
-                extraction_date=extraction_date,
-                file_hash=file_hash
-            )
+            try:
+                total_files = header.get('total_files', total_files)
+                if 'date' in header:
+                    date_str = header['date']
+                    try:
+                        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+                        extraction_date = dt.strftime('%Y-%m-%d %H:%M:%S')
+                    except:
+                        extraction_date = date_str[:19] if len(date_str) > 19 else date_str
+            except:
+                pass
+            
+            def render():
+                if self.export_map is not None:
+                    start, end = self.files_span
+                    data_json = html_safe_json(self.export_map[start:end])
+                else:
+                    data_json = html_safe_json(self.viewer_json)
+                return Response(render_template(
+                    self.template,
+                    data_json=data_json,
+                    total_files=total_files,
+                    extraction_date=extraction_date,
+                    file_hash=file_hash,
+                    types=self.facets['file_type'],
+                    owners=self.facets['owner_email'],
+                    debug=self.app.debug
+                ), mimetype='text/html')
+            
+            # Only stable inputs: without an export header the date shown is the
+            # current time, which would change the tag on every request
+            etag = hashlib.sha256(
+                f'{self.data_etag}:{file_hash}:{header_date}:{self.app.debug}'.encode()
+            ).hexdigest()
+            return self._conditional_response(etag, render)
         
         @self.app.route('/api/data')
         def api_data():
-            return jsonify(self.metadata)
+            if self.export_map is not None:
+                start, end = self.files_span
+                
+                def stream():
+                    for offset in range(start, end, STREAM_CHUNK_SIZE):
+                        yield self.export_map[offset:min(offset + STREAM_CHUNK_SIZE, end)]
+                
+                return self._conditional_response(
+                    self.data_etag,
+                    lambda: Response(stream(), mimetype='application/json')
+                )
+            
+            payload = self.api_payload
+            if payload is None:
+                data = serialize_metadata(self.metadata or [])
+                payload = self.api_payload = (data, hashlib.sha256(data).hexdigest())
+            return self._conditional_response(
+                payload[1],
+                lambda: Response(payload[0], mimetype='application/json')
+            )
     
     def start_server(self, open_browser: bool = True):
         """
@@ -668,19 +1236,12 @@ class WebViewer:
         Args:
             open_browser: Whether to automatically open browser
         """
-        if open_browser:
-            def open_browser_delayed():
-                time.sleep(1.5)
-                webbrowser.open(f'http://localhost:{self.port}')
-            
-            threading.Thread(target=open_browser_delayed, daemon=True).start()
-        
         print(f"\n{'='*60}")
         print(f"🌐 Web viewer started at: http://localhost:{self.port}")
         print(f"{'='*60}\n")
         print("Press Ctrl+C to stop the server\n")
         
         try:
-            self.app.run(host='127.0.0.1', port=self.port, debug=False, use_reloader=False)
+            serve(self.app, self.port, open_browser)
         except KeyboardInterrupt:
             print("\n\nServer stopped.")
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+Tests for the on-disk listing cache
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from cache import ListingCache
+
+
+class ListingCacheTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_scopes_are_kept_apart_per_account(self):
+        first = ListingCache.for_scope(None, False, '111', cache_dir=self.cache_dir)
+        first.replace([{'id': 'a', 'createdTime': '2024-01-01T00:00:00.000Z'}], set(), 'token-1')
+        first.close()
+        
+        second = ListingCache.for_scope(None, False, '222', cache_dir=self.cache_dir)
+        self.assertIsNone(second.get_start_page_token())
+        self.assertEqual(second.load_files(), [])
+        second.close()
+    
+    def test_rejects_missing_account(self):
+        for account_id in ('', '../other', None):
+            with self.assertRaises(ValueError):
+                ListingCache.for_scope(None, False, account_id, cache_dir=self.cache_dir)
+    
+    def test_load_files_in_created_time_order(self):
+        cache = ListingCache(self.cache_dir / 'drive.sqlite')
+        files = [
+            {'id': 'c', 'createdTime': '2024-03-01T00:00:00.000Z'},
+            {'id': 'a', 'createdTime': '2024-01-01T00:00:00.000Z'},
+            {'id': 'b', 'createdTime': '2024-02-01T00:00:00.000Z'},
+        ]
+        cache.replace(files, set(), 'token-1')
+        cache.apply_changes([{'id': 'a', 'createdTime': '2024-01-01T00:00:00.000Z', 'name': 'renamed'}], [], 'token-2')
+        
+        self.assertEqual([file['id'] for file in cache.load_files()], ['a', 'b', 'c'])
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests that the orjson fast paths of the exporters write the same bytes as
+the stdlib json encoder they replace
+"""
+import io
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import exporters
+from exporters import ForensicDigest, JSONExporter
+
+EDGE_CASE_STRINGS = [
+    'plain.txt',
+    'quote " backslash \\ slash /',
+    'controls \x00\x01\x08\t\n\x0b\x0c\r\x1b\x1f\x7f end',
+    'latin ñ é ß, cjk 文件, rtl שלום',
+    'non-BMP \U0001f600 \U0001d11e \U0010ffff',
+    'line separators \u2028 \u2029',
+    'combining e\u0301 and zero width \u200b\ufeff',
+    '',
+]
+
+
+def edge_case_records():
+    return [
+        {'id': f'id-{index}', 'name': text, 'description': text[::-1], 'owner_email': 'owner@example.com'}
+        for index, text in enumerate(EDGE_CASE_STRINGS)
+    ]
+
+
+@unittest.skipIf(exporters.orjson is None, 'orjson is not installed')
+class OrjsonByteIdentityTest(unittest.TestCase):
+    
+    def test_forensic_payload_matches_stdlib(self):
+        data = {'files': edge_case_records()}
+        expected = json.dumps(
+            data, indent=None, separators=(',', ':'), ensure_ascii=False, sort_keys=True
+        ).encode('utf-8')
+        self.assertEqual(exporters.orjson.dumps(data, option=exporters.orjson.OPT_SORT_KEYS), expected)
+        self.assertEqual(ForensicDigest._serialized(data), expected)
+    
+    def test_forensic_hash_does_not_depend_on_orjson(self):
+        metadata = edge_case_records()
+        fast = ForensicDigest(metadata).hash
+        with mock.patch.object(exporters, 'orjson', None):
+            self.assertEqual(ForensicDigest(metadata).hash, fast)
+    
+    def write_document(self, export_data):
+        buffer = io.BytesIO()
+        JSONExporter._write_document(None, buffer, export_data)
+        return buffer.getvalue()
+    
+    def test_streamed_document_matches_stdlib(self):
+        records = edge_case_records()
+        records[0].update(size=1024, shared=True, starred=False, parents=['a', 'b'], version=None)
+        for files in (records, []):
+            export_data = {
+                'extraction_metadata': {'date': '2024-01-01T00:00:00', 'total_files': len(files),
+                                        'tool': 'Metadata Sniffer ✓'},
+                'files': files
+            }
+            expected = json.dumps(export_data, indent=2, ensure_ascii=False).encode('utf-8')
+            with self.subTest(files=len(files)):
+                self.assertEqual(self.write_document(export_data), expected)
+                with mock.patch.object(exporters, 'orjson', None):
+                    self.assertEqual(self.write_document(export_data), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+"""
+Tests for the Google Drive metadata extractor
+"""
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from cache import ListingCache
+from extractor import MetadataExtractor, BATCH_SIZE, BATCH_CALLS_PER_SECOND
+
+
+class RecordedRequest:
+    """Stand-in for a googleapiclient HttpRequest returning a canned response"""
+    
+    def __init__(self, response):
+        self.response = response
+    
+    def execute(self):
+        return self.response
+
+
+class RecordingChanges:
+    """Stand-in for service.changes() that records the keyword arguments of each call"""
+    
+    def __init__(self):
+        self.calls = {}
+    
+    def getStartPageToken(self, **kwargs):
+        self.calls['getStartPageToken'] = kwargs
+        return RecordedRequest({'startPageToken': 'token-2'})
+    
+    def list(self, **kwargs):
+        self.calls['list'] = kwargs
+        return RecordedRequest({'newStartPageToken': 'token-2', 'changes': []})
+
+
+class RecordingService:
+    """Stand-in for the Drive service exposing only the Changes API"""
+    
+    def __init__(self):
+        self.recorded_changes = RecordingChanges()
+    
+    def changes(self):
+        return self.recorded_changes
+
+
+class FakeDrive:
+    """
+    In-memory Drive with a user corpus and a shared drive. files.list serves
+    the user corpus like the whole-Drive scan; the Changes API reports every
+    modification across all drives since a token.
+    """
+    
+    def __init__(self):
+        self.files = {}
+        self.log = []
+    
+    def put(self, file_id, created, drive_id=None, trashed=False):
+        file = {'id': file_id, 'name': f'{file_id}.txt', 'mimeType': 'text/plain',
+                'createdTime': created, 'trashed': trashed}
+        if drive_id:
+            file['driveId'] = drive_id
+        self.files[file_id] = file
+        self.log.append(file_id)
+    
+    def token(self):
+        return str(len(self.log))
+    
+    def files_list(self, q=None, pageToken=None, **kwargs):
+        listed = [
+            {key: value for key, value in file.items() if key != 'driveId'}
+            for file in sorted(self.files.values(), key=lambda file: file['createdTime'])
+            if 'driveId' not in file and not (q and 'trashed = false' in q and file['trashed'])
+        ]
+        return RecordedRequest({'files': listed})
+    
+    def changes_list(self, pageToken, **kwargs):
+        changed = dict.fromkeys(self.log[int(pageToken):])
+        changes = [{'fileId': file_id, 'removed': False, 'file': dict(self.files[file_id])}
+                   for file_id in changed]
+        return RecordedRequest({'changes': changes, 'newStartPageToken': self.token()})
+    
+    def changes(self):
+        return SimpleNamespace(
+            list=self.changes_list,
+            getStartPageToken=lambda **kwargs: RecordedRequest({'startPageToken': self.token()})
+        )
+
+
+class FakeDriveService:
+    """Drive service stand-in backed by a FakeDrive"""
+    
+    def __init__(self, drive):
+        self.drive = drive
+    
+    def files(self):
+        return SimpleNamespace(list=self.drive.files_list)
+    
+    def changes(self):
+        return self.drive.changes()
+
+
+class IncrementalWholeDriveTest(unittest.TestCase):
+    """An incremental whole-Drive run must list the same files as a cold scan"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ListingCache(Path(self.tmp.name) / 'drive.sqlite')
+    
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+    
+    def collect(self, drive, cache=None):
+        extractor = MetadataExtractor(FakeDriveService(drive), cache=cache)
+        return {file['id'] for file in extractor._collect_files(None, False)}
+    
+    def test_cached_run_matches_fresh_scan(self):
+        drive = FakeDrive()
+        drive.put('mine-1', '2024-01-01T00:00:00.000Z')
+        drive.put('shared-1', '2024-01-02T00:00:00.000Z', drive_id='team')
+        self.assertEqual(self.collect(drive, self.cache), {'mine-1'})
+        
+        drive.put('mine-2', '2024-02-01T00:00:00.000Z')
+        drive.put('shared-2', '2024-02-02T00:00:00.000Z', drive_id='team')
+        drive.put('mine-1', '2024-01-01T00:00:00.000Z', trashed=True)
+        
+        cached = self.collect(drive, self.cache)
+        self.assertEqual(cached, self.collect(drive))
+        self.assertEqual(cached, {'mine-2'})
+        self.assertNotIn('driveId', json.dumps(self.cache.load_files()))
+
+
+class FakeBatch:
+    """BatchHttpRequest stand-in that answers every call at once"""
+    
+    def __init__(self, callback):
+        self.callback = callback
+        self.request_ids = []
+    
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+    
+    def execute(self):
+        for request_id in self.request_ids:
+            self.callback(request_id, {'files': []}, None)
+
+
+class BatchPacingTest(unittest.TestCase):
+    """Every call in a batch counts against the per-user quota"""
+    
+    def run_batches(self, calls, **kwargs):
+        service = SimpleNamespace(new_batch_http_request=lambda callback: FakeBatch(callback))
+        extractor = MetadataExtractor(service, **kwargs)
+        with mock.patch('extractor.time.sleep') as sleep:
+            extractor._execute_batch([object()] * calls)
+        return [call.args[0] for call in sleep.call_args_list]
+    
+    def test_batches_are_paced_per_call(self):
+        sleeps = self.run_batches(3 * BATCH_SIZE)
+        self.assertEqual(len(sleeps), 2)
+        for seconds in sleeps:
+            self.assertGreater(seconds, BATCH_SIZE / BATCH_CALLS_PER_SECOND * 0.9)
+    
+    def test_max_qps_replaces_default_pacing(self):
+        sleeps = self.run_batches(2 * BATCH_SIZE, max_qps=1000)
+        self.assertEqual(len(sleeps), 1)
+        self.assertLess(sleeps[0], 1.0)
+
+
+class ChangesApiSharedDrivesTest(unittest.TestCase):
+    """The Changes API calls must cover shared drives like files.list does"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ListingCache(Path(self.tmp.name) / 'drive.sqlite')
+        self.service = RecordingService()
+        self.extractor = MetadataExtractor(self.service, cache=self.cache)
+    
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+    
+    def test_start_page_token_supports_all_drives(self):
+        self.extractor._collect_drive_files = lambda include_trashed, progress_callback: []
+        self.extractor._collect_files(None, False)
+        
+        kwargs = self.service.recorded_changes.calls['getStartPageToken']
+        self.assertIs(kwargs.get('supportsAllDrives'), True)
+        self.assertEqual(self.cache.get_start_page_token(), 'token-2')
+    
+    def test_changes_list_includes_all_drives(self):
+        self.cache.replace([], set(), 'token-1')
+        self.extractor._collect_files(None, False)
+        
+        kwargs = self.service.recorded_changes.calls['list']
+        self.assertEqual(kwargs.get('pageToken'), 'token-1')
+        self.assertIs(kwargs.get('supportsAllDrives'), True)
+        self.assertIs(kwargs.get('includeItemsFromAllDrives'), True)
+        self.assertNotIn('getStartPageToken', self.service.recorded_changes.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
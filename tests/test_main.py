@@ -0,0 +1,112 @@
+"""
+Tests for reading the CLI options from METADATA_SNIFFER_ARGS_JSON
+"""
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main
+
+
+def load(**options):
+    """Runs load_args_from_env with the given options in the environment variable"""
+    with mock.patch.dict(os.environ, {main.ARGS_ENV_VAR: json.dumps(options)}):
+        return main.load_args_from_env([])
+
+
+class LoadArgsFromEnvTest(unittest.TestCase):
+    
+    def test_unset_variable(self):
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertIsNone(main.load_args_from_env())
+    
+    def test_defaults(self):
+        args = load()
+        self.assertEqual(vars(args), main.DEFAULT_ARGS)
+    
+    def test_string_flags_are_coerced(self):
+        args = load(no_cache='false', refresh='true', no_batch=0, force_pdf='yes', include_trashed='False')
+        self.assertIs(args.no_cache, False)
+        self.assertIs(args.refresh, True)
+        self.assertIs(args.no_batch, False)
+        self.assertIs(args.force_pdf, True)
+        self.assertIs(args.include_trashed, False)
+    
+    def test_numbers_are_coerced(self):
+        args = load(workers='4', max_qps='2.5')
+        self.assertEqual(args.workers, 4)
+        self.assertIsInstance(args.workers, int)
+        self.assertEqual(args.max_qps, 2.5)
+        self.assertIsInstance(args.max_qps, float)
+        
+        args = load(workers=8.0, max_qps=10)
+        self.assertEqual(args.workers, 8)
+        self.assertIsInstance(args.max_qps, float)
+    
+    def test_dashed_keys(self):
+        args = load(**{'no-cache': True, 'max-qps': 3})
+        self.assertIs(args.no_cache, True)
+        self.assertEqual(args.max_qps, 3.0)
+    
+    def test_invalid_values_exit(self):
+        invalid = [
+            {'format': 'xml'},
+            {'backend': 'gpu'},
+            {'workers': 'four'},
+            {'workers': 2.5},
+            {'workers': 0},
+            {'workers': True},
+            {'max_qps': -1},
+            {'max_qps': 'fast'},
+            {'max_qps': 'nan'},
+            {'max_qps': 'inf'},
+            {'workers': 'inf'},
+            {'no_cache': 'maybe'},
+            {'refresh': 2},
+            {'output': ''},
+            {'folder_id': 123},
+        ]
+        for options in invalid:
+            with self.subTest(options=options):
+                with self.assertRaises(SystemExit) as raised:
+                    load(**options)
+                name = next(iter(options))
+                self.assertIn(f"'{name}'", str(raised.exception.code))
+    
+    def test_command_line_arguments_are_refused(self):
+        with mock.patch.dict(os.environ, {main.ARGS_ENV_VAR: '{}'}):
+            with self.assertRaises(SystemExit) as raised:
+                main.load_args_from_env(['--format', 'csv'])
+        self.assertIn('--format csv', str(raised.exception.code))
+    
+    def test_unknown_option_exits(self):
+        with self.assertRaises(SystemExit):
+            load(colour='red')
+
+
+class ParseArgsNumbersTest(unittest.TestCase):
+    """The command line applies the same number checks as the environment variable"""
+    
+    def parse(self, *argv):
+        with mock.patch.object(sys, 'argv', ['main.py', *argv]):
+            return main.parse_args()
+    
+    def test_valid_numbers(self):
+        args = self.parse('--workers', '3', '--max-qps', '2.5')
+        self.assertEqual((args.workers, args.max_qps), (3, 2.5))
+    
+    def test_invalid_numbers_exit(self):
+        for argv in (['--workers', '0'], ['--workers', '-2'], ['--max-qps', '-5'],
+                     ['--max-qps', 'nan'], ['--max-qps', 'inf'], ['--max-qps', '0']):
+            with self.subTest(argv=argv):
+                with mock.patch('sys.stderr'), self.assertRaises(SystemExit):
+                    self.parse(*argv)
+
+
+if __name__ == '__main__':
+    unittest.main()
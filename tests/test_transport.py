@@ -0,0 +1,72 @@
+"""
+Tests for the HTTP/2 transport
+"""
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import transport
+from extractor import MetadataExtractor
+
+
+@unittest.skipUnless(transport.HTTP2_AVAILABLE, 'httpx with HTTP/2 support is not installed')
+class Http2TransportErrorsTest(unittest.TestCase):
+    """httpx errors must surface as the socket errors httplib2 raises"""
+    
+    def request_raising(self, error):
+        http = transport.Http2Transport()
+        
+        def handler(request):
+            raise error
+        
+        http.client = transport.httpx.Client(transport=transport.httpx.MockTransport(handler))
+        try:
+            http.request('https://www.googleapis.com/drive/v3/files')
+        finally:
+            http.close()
+    
+    def test_dropped_stream_is_connection_error(self):
+        with self.assertRaises(ConnectionError):
+            self.request_raising(transport.httpx.RemoteProtocolError('stream reset'))
+        with self.assertRaises(ConnectionError):
+            self.request_raising(transport.httpx.ConnectError('connection refused'))
+    
+    def test_timeout_is_timeout_error(self):
+        with self.assertRaises(TimeoutError):
+            self.request_raising(transport.httpx.ReadTimeout('read timed out'))
+
+
+class FlakyRequest:
+    """Request stand-in that fails with the given errors before succeeding"""
+    
+    def __init__(self, *errors):
+        self.errors = list(errors)
+    
+    def execute(self):
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'files': []}
+
+
+class ExecuteNetworkRetryTest(unittest.TestCase):
+    
+    @mock.patch('extractor.time.sleep')
+    def test_network_errors_are_retried(self, sleep):
+        extractor = MetadataExtractor(service=None)
+        request = FlakyRequest(ConnectionError('stream reset'), TimeoutError('timed out'))
+        self.assertEqual(extractor._execute(request), {'files': []})
+        self.assertEqual(sleep.call_count, 2)
+    
+    @mock.patch('extractor.time.sleep')
+    def test_persistent_network_error_is_raised(self, sleep):
+        extractor = MetadataExtractor(service=None)
+        request = FlakyRequest(*[ConnectionError('down')] * 20)
+        with self.assertRaises(ConnectionError):
+            extractor._execute(request)
+
+
+if __name__ == '__main__':
+    unittest.main()
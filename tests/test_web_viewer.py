@@ -0,0 +1,34 @@
+"""
+Tests for the results viewer
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import web_viewer
+from web_viewer import WebViewer
+
+
+class ViewerIndexEtagTest(unittest.TestCase):
+    
+    def test_in_memory_page_is_revalidated(self):
+        metadata = [{'id': 'a', 'name': 'report.pdf', 'file_type': 'PDF', 'owner_email': 'owner@example.com'}]
+        with tempfile.TemporaryDirectory() as tmp:
+            client = WebViewer(metadata, str(Path(tmp) / 'report')).app.test_client()
+            first = client.get('/')
+            self.assertEqual(first.status_code, 200)
+            
+            # Without an export header the page shows the current time; the tag must not follow it
+            later = web_viewer.datetime.now().replace(year=2099)
+            with mock.patch.object(web_viewer, 'datetime', wraps=web_viewer.datetime) as clock:
+                clock.now.return_value = later
+                second = client.get('/', headers={'If-None-Match': first.headers['ETag']})
+            self.assertEqual(second.status_code, 304)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,59 +4,174 @@ Web application for forensic metadata extraction from Google Drive
 """
 import os
 import sys
+import re
 import json
+import gzip
+import queue
+import hashlib
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import RawValue
 from pathlib import Path
 from datetime import datetime
-from flask import Flask, render_template_string, request, jsonify, send_file
+from functools import lru_cache
+from flask import Flask, Response, render_template, render_template_string, request, jsonify, send_file
 from flask_cors import CORS
-from flask.json import jsonify as flask_jsonify
-import webbrowser
+from flask.json.provider import DefaultJSONProvider
+from googleapiclient.errors import HttpError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:
+    rcssmin = rjsmin = None
 
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson, keeping Flask's sorted keys"""
+    
+    def dumps(self, obj, **kwargs):
+        if not kwargs.get('indent'):
+            try:
+                return orjson.dumps(
+                    obj,
+                    default=kwargs.get('default', self.default),
+                    option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                ).decode('utf-8')
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 def setup_jinja_filters(app):
     """Setup custom Jinja2 filters"""
     @app.template_filter('tojson')
     def tojson_filter(obj):
-        """Convert Python object to JSON string"""
-        return json.dumps(obj, ensure_ascii=False)
+        """Convert Python object to JSON string that is safe inside <script>"""
+        return html_safe_json(serialize_metadata(obj))
     
     if 'tojson' not in app.jinja_env.filters:
         app.jinja_env.filters['tojson'] = tojson_filter
 
-from auth import authenticate, test_connection
+from auth import authenticate, test_connection, prewarm_connections, get_account_id
 from extractor import MetadataExtractor
-from exporters import CSVExporter, JSONExporter, PDFExporter
-from web_viewer import calculate_file_hash, HTML_TEMPLATE
+from exporters import CSVExporter, JSONExporter, PDFExporter, ForensicDigest
+from cache import ListingCache
+from web_viewer import (calculate_file_hash, collect_facets, compress_response, html_safe_json,
+                        serialize_metadata, serve, viewer_rows, HTML_TEMPLATE)
 from helpers import extract_folder_id_from_url
 
 app = Flask(__name__)
+# Behind nginx/Apache, let the front-end server send downloads (X-Sendfile)
+app.config['USE_X_SENDFILE'] = bool(os.environ.get('METADATA_SNIFFER_X_SENDFILE'))
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)
+app.after_request(compress_response)
 
 setup_jinja_filters(app)
 
-extraction_state = {
-    'status': 'idle',
-    'progress': 0,
-    'total': 0,
-    'current_phase': '',
-    'message': '',
-    'metadata': None,
-    'output_path': None,
-    'error': None,
-    'start_time': None,
-    'elapsed_time': 0
-}
-
-extraction_lock = threading.Lock()
-extraction_thread = None
-pause_event = threading.Event()
-stop_event = threading.Event()
+def new_extraction_state(status: str = 'idle', message: str = '') -> dict:
+    """Returns a fresh extraction state dictionary"""
+    return {
+        'status': status,
+        'current_phase': '',
+        'message': message,
+        'output_path': None,
+        'error': None,
+        'start_time': None,
+        'elapsed_time': 0
+    }
+
+
+class StateLock(threading.Condition):
+    """Lock guarding the extraction state; every release wakes the progress streams"""
+    
+    def __exit__(self, *args):
+        self.notify_all()
+        return super().__exit__(*args)
+
+
+extraction_lock = StateLock()
+
+
+class ExtractionRun:
+    """
+    State, progress counters and stop/pause flags of one extraction. Every
+    submitted extraction gets its own instance, so a run that was stopped and
+    is still winding down never shares flags or state with the run started
+    after it.
+    """
+    
+    def __init__(self, state: dict):
+        """
+        Args:
+            state: State dictionary shown while this run is the current one
+        """
+        self.state = state
+        self.stop_event = threading.Event()
+        self.pause_event = threading.Event()
+        self.resume_event = threading.Event()
+        self.resume_event.set()
+        # Written on every progress callback, so updated without extraction_lock
+        self.progress = RawValue('q', 0)
+        self.total = RawValue('q', 0)
+        # Monotonic clock reading matching state['start_time'], so the
+        # elapsed time is immune to wall-clock adjustments
+        self.started_at = 0.0
+        self.last_phase = None
+        self.last_publish = 0.0
+    
+    def elapsed_seconds(self) -> float:
+        """Returns the time since the run started. Call with extraction_lock held."""
+        return time.monotonic() - self.started_at
+    
+    def set_counts(self, progress: int, total: int):
+        """Stores the progress counters without taking extraction_lock"""
+        self.progress.value = progress
+        self.total.value = total
+    
+    def set_paused(self, paused: bool):
+        """Sets or clears the pause flag; clearing it wakes a paused run at once"""
+        if paused:
+            self.pause_event.set()
+            self.resume_event.clear()
+        else:
+            self.pause_event.clear()
+            self.resume_event.set()
+    
+    def stop(self):
+        """Asks the run to stop, waking it if it is paused"""
+        self.stop_event.set()
+        self.set_paused(False)
+    
+    def mark_stopped(self):
+        """Records that the run ended because it was stopped"""
+        with extraction_lock:
+            self.state['status'] = 'stopped'
+            self.state['message'] = 'Extraction stopped by user'
+
+
+current_run = ExtractionRun(new_extraction_state())
+extraction_queue = queue.SimpleQueue()
 extraction_thread = None
-pause_event = threading.Event()
-stop_event = threading.Event()
+ACTIVE_STATUSES = ('queued', 'running', 'paused')
+
 
 MAIN_TEMPLATE = """
 <!DOCTYPE html>
@@ -389,14 +504,15 @@ MAIN_TEMPLATE = """
                     </div>
                     
                     <div class="form-group">
-                        <label for="workers">Parallel Workers</label>
+                        <label for="workers">Worker Processes</label>
                         <select id="workers" name="workers">
-                            <option value="1">1 worker (Sequential - Recommended for Stability)</option>
-                            <option value="auto">Auto (Max 4 workers)</option>
-                            <option value="2">2 workers</option>
-                            <option value="4">4 workers (Max - May cause issues)</option>
+                            <option value="1">1 (Sequential - Recommended for Stability)</option>
+                            <option value="auto">Auto (one per CPU core)</option>
+                            <option value="2">2 processes</option>
+                            <option value="4">4 processes</option>
+                            <option value="8">8 processes</option>
                         </select>
-                        <small>⚠ Use 1 worker if experiencing crashes. Sequential processing is safest.</small>
+                        <small>⚠ More than 1 processes files in a pool of worker processes. Use 1 if experiencing crashes.</small>
                     </div>
                     
                     <div class="form-group">
@@ -464,7 +580,7 @@ MAIN_TEMPLATE = """
     </div>
     
     <script>
-        let pollInterval = null;
+        let progressEvents = null;
         
         document.getElementById('extraction-form').addEventListener('submit', async (e) => {
             e.preventDefault();
@@ -569,10 +685,7 @@ MAIN_TEMPLATE = """
                         document.getElementById('phase-text').textContent = 'Initializing...';
                         document.getElementById('time-text').textContent = '00:00';
                         
-                        if (pollInterval) {
-                            clearInterval(pollInterval);
-                            pollInterval = null;
-                        }
+                        stopPolling();
                     }
                 } catch (error) {
                     console.error('Error stopping extraction:', error);
@@ -581,46 +694,58 @@ MAIN_TEMPLATE = """
         });
         
         function startPolling() {
-            pollInterval = setInterval(async () => {
-                try {
-                    const response = await fetch('/api/progress');
-                    const data = await response.json();
-                    
-                    updateProgress(data);
-                    
-                    const startBtn = document.getElementById('start-btn');
-                    const pauseBtn = document.getElementById('pause-btn');
-                    const stopBtn = document.getElementById('stop-btn');
+            stopPolling();
+            progressEvents = new EventSource('/api/events');
+            progressEvents.onmessage = (event) => {
+                const data = JSON.parse(event.data);
+                
+                updateProgress(data);
+                
+                const startBtn = document.getElementById('start-btn');
+                const pauseBtn = document.getElementById('pause-btn');
+                const stopBtn = document.getElementById('stop-btn');
+                
+                if (data.status === 'queued') {
+                    startBtn.textContent = '⏳ Queued';
+                    startBtn.disabled = true;
+                    pauseBtn.style.display = 'none';
+                    stopBtn.style.display = 'inline-block';
+                } else if (data.status === 'running') {
+                    startBtn.textContent = '⏸️ Pause';
+                    startBtn.disabled = false;
+                    pauseBtn.style.display = 'none';
+                    stopBtn.style.display = 'inline-block';
+                } else if (data.status === 'paused') {
+                    startBtn.textContent = '⏸️ Paused';
+                    startBtn.disabled = true;
+                    pauseBtn.textContent = '▶️ Resume';
+                    pauseBtn.style.display = 'inline-block';
+                    stopBtn.style.display = 'inline-block';
+                } else if (data.status === 'completed' || data.status === 'error' || data.status === 'stopped') {
+                    stopPolling();
+                    startBtn.textContent = '🚀 Start Extraction';
+                    startBtn.disabled = false;
+                    pauseBtn.style.display = 'none';
+                    stopBtn.style.display = 'none';
                     
-                    if (data.status === 'running') {
-                        startBtn.textContent = '⏸️ Pause';
-                        startBtn.disabled = false;
-                        pauseBtn.style.display = 'none';
-                        stopBtn.style.display = 'inline-block';
-                    } else if (data.status === 'paused') {
-                        startBtn.textContent = '⏸️ Paused';
-                        startBtn.disabled = true;
-                        pauseBtn.textContent = '▶️ Resume';
-                        pauseBtn.style.display = 'inline-block';
-                        stopBtn.style.display = 'inline-block';
-                    } else if (data.status === 'completed' || data.status === 'error' || data.status === 'stopped') {
-                        clearInterval(pollInterval);
-                        startBtn.textContent = '🚀 Start Extraction';
-                        startBtn.disabled = false;
-                        pauseBtn.style.display = 'none';
-                        stopBtn.style.display = 'none';
-                        
-                        if (data.status === 'completed') {
-                            document.getElementById('results-section').classList.add('active');
-                            showResults(data);
-                        } else if (data.status === 'stopped') {
-                            document.getElementById('progress-section').classList.remove('active');
-                        }
+                    if (data.status === 'completed') {
+                        document.getElementById('results-section').classList.add('active');
+                        showResults(data);
+                    } else if (data.status === 'stopped') {
+                        document.getElementById('progress-section').classList.remove('active');
                     }
-                } catch (error) {
-                    console.error('Error polling progress:', error);
                 }
-            }, 500);
+            };
+            progressEvents.onerror = (error) => {
+                console.error('Error in progress stream:', error);
+            };
+        }
+        
+        function stopPolling() {
+            if (progressEvents) {
+                progressEvents.close();
+                progressEvents = null;
+            }
         }
         
         function updateProgress(data) {
@@ -683,13 +808,11 @@ MAIN_TEMPLATE = """
             document.getElementById('extraction-form').reset();
             document.getElementById('progress-section').classList.remove('active');
             document.getElementById('results-section').classList.remove('active');
-            if (pollInterval) {
-                clearInterval(pollInterval);
-            }
+            stopPolling();
         }
         
         fetch('/api/progress').then(r => r.json()).then(data => {
-            if (data.status === 'running') {
+            if (data.status === 'running' || data.status === 'queued') {
                 document.getElementById('progress-section').classList.add('active');
                 document.getElementById('start-btn').disabled = true;
                 startPolling();
@@ -704,175 +827,284 @@ MAIN_TEMPLATE = """
 """
 
 
-def update_progress(status, progress, total, message):
-    """Update extraction progress"""
-    global extraction_state
+SERVICE_CACHE_TTL = 300
+PDF_MAX_ROWS = 50000  # same limit as the CLI; larger reports take too long to render
+TOKEN_FILE = 'token.json'
+_service_cache = {'service': None, 'verified_at': 0.0, 'token_mtime': None}
+
+
+def token_mtime():
+    """Returns the modification time of the token file, or None if it is missing"""
+    try:
+        return os.stat(TOKEN_FILE).st_mtime
+    except OSError:
+        return None
+
+
+def get_service():
+    """
+    Returns an authenticated and verified Google Drive service. The service
+    is reused for SERVICE_CACHE_TTL seconds after its connection test, as
+    long as the token file has not changed.
+    
+    Returns:
+        googleapiclient.discovery.Resource: Authenticated Google Drive service
+    
+    Raises:
+        Exception: If the connection with Google Drive cannot be established
+    """
+    now = time.time()
+    if (_service_cache['service'] is not None
+            and now - _service_cache['verified_at'] < SERVICE_CACHE_TTL
+            and _service_cache['token_mtime'] == token_mtime()):
+        return _service_cache['service']
+    
+    service = authenticate()
+    if not test_connection(service):
+        invalidate_service()
+        raise Exception("Could not establish connection with Google Drive")
+    
+    _service_cache.update(service=service, verified_at=now, token_mtime=token_mtime())
+    return service
+
+
+def invalidate_service():
+    """Drops the cached Google Drive service so the next extraction re-authenticates"""
+    _service_cache.update(service=None, verified_at=0.0, token_mtime=None)
+
+
+PROGRESS_PUBLISH_INTERVAL = 0.1
+
+
+def update_progress(run, status, progress, total, message):
+    """
+    Update extraction progress. The counters are stored on every call without
+    locking; the phase and message are published under extraction_lock at
+    most every PROGRESS_PUBLISH_INTERVAL seconds within a phase. Phase
+    changes and the final update of a phase are always published. The
+    elapsed time is computed when progress is read, not here.
+    """
+    run.set_counts(progress, total)
+    published_at = time.monotonic()
+    finished = total > 0 and progress >= total
+    if (status == run.last_phase and not finished
+            and published_at - run.last_publish < PROGRESS_PUBLISH_INTERVAL):
+        return
+    run.last_phase = status
+    run.last_publish = published_at
+    
     with extraction_lock:
-        extraction_state['current_phase'] = status
-        extraction_state['progress'] = progress
-        extraction_state['total'] = total
-        extraction_state['message'] = message
-        if extraction_state['start_time']:
-            extraction_state['elapsed_time'] = time.time() - extraction_state['start_time']
+        run.state['current_phase'] = status
+        run.state['message'] = message
 
 
-def run_extraction(folder_id, output_name, workers, include_trashed, export_formats):
-    """Run extraction in background thread"""
-    global extraction_state, pause_event, stop_event
+def run_extraction(run, folder_id, output_name, workers, include_trashed, export_formats):
+    """
+    Run extraction in background thread. All state is written to the run's
+    own state dictionary, which is only displayed while it is the current run.
+    """
+    state = run.state
     
-    pause_event.clear()
-    stop_event.clear()
+    if run.stop_event.is_set():
+        run.mark_stopped()
+        return
     
     try:
         with extraction_lock:
-            extraction_state['status'] = 'running'
-            extraction_state['progress'] = 0
-            extraction_state['total'] = 0
-            extraction_state['error'] = None
-            extraction_state['start_time'] = time.time()
-            extraction_state['current_phase'] = 'authenticating'
-            extraction_state['message'] = 'Connecting to Google Drive...'
-            extraction_state['metadata'] = None
-            extraction_state['output_path'] = None
-        
-        if stop_event.is_set():
-            with extraction_lock:
-                extraction_state['status'] = 'stopped'
-                extraction_state['message'] = 'Extraction stopped by user'
-            return
-        
-        update_progress('authenticating', 0, 0, 'Authenticating with Google Drive...')
-        if stop_event.is_set():
-            with extraction_lock:
-                extraction_state['status'] = 'stopped'
-                extraction_state['message'] = 'Extraction stopped by user'
+            state['status'] = 'running'
+            run.set_counts(0, 0)
+            state['error'] = None
+            state['start_time'] = time.time()
+            run.started_at = time.monotonic()
+            state['current_phase'] = 'authenticating'
+            state['message'] = 'Connecting to Google Drive...'
+            state['output_path'] = None
+        
+        update_progress(run, 'authenticating', 0, 0, 'Authenticating with Google Drive...')
+        if run.stop_event.is_set():
+            run.mark_stopped()
             return
         
-        service = authenticate()
-        if not test_connection(service):
-            raise Exception("Could not establish connection with Google Drive")
+        service = get_service()
         
-        update_progress('initializing', 0, 0, 'Initializing extractor...')
-        if stop_event.is_set():
-            with extraction_lock:
-                extraction_state['status'] = 'stopped'
-                extraction_state['message'] = 'Extraction stopped by user'
+        update_progress(run, 'initializing', 0, 0, 'Initializing extractor...')
+        if run.stop_event.is_set():
+            run.mark_stopped()
             return
         
-        extractor = MetadataExtractor(service, max_workers=workers)
+        cache = ListingCache.for_scope(folder_id, include_trashed, get_account_id(service))
+        # A single worker formats files in this thread; anything else uses a process pool
+        backend = 'thread' if workers == 1 else 'process'
+        extractor = MetadataExtractor(service, max_workers=workers, backend=backend, cache=cache)
         
         def progress_callback(status, progress, total, message):
-            if stop_event.is_set():
+            if run.stop_event.is_set():
                 return
-            if pause_event.is_set():
+            if run.pause_event.is_set():
                 with extraction_lock:
-                    extraction_state['status'] = 'paused'
-                    extraction_state['message'] = 'Extraction paused. Click Resume to continue.'
-                while pause_event.is_set() and not stop_event.is_set():
-                    time.sleep(0.1)
-                if stop_event.is_set():
+                    state['status'] = 'paused'
+                    state['message'] = 'Extraction paused. Click Resume to continue.'
+                while run.pause_event.is_set() and not run.stop_event.is_set():
+                    run.resume_event.wait()
+                if run.stop_event.is_set():
                     return
                 with extraction_lock:
-                    if extraction_state['status'] == 'paused':
-                        extraction_state['status'] = 'running'
-                        extraction_state['message'] = 'Resuming extraction...'
-            update_progress(status, progress, total, message)
-        
-        metadata = extractor.extract_folder(
-            folder_id=folder_id,
-            include_trashed=include_trashed,
-            progress_callback=progress_callback
-        )
-        
-        if stop_event.is_set():
-            with extraction_lock:
-                extraction_state['status'] = 'stopped'
-                extraction_state['message'] = 'Extraction stopped by user'
+                    if state['status'] == 'paused':
+                        state['status'] = 'running'
+                        state['message'] = 'Resuming extraction...'
+            update_progress(run, status, progress, total, message)
+        
+        try:
+            metadata = extractor.extract_folder(
+                folder_id=folder_id,
+                include_trashed=include_trashed,
+                progress_callback=progress_callback
+            )
+        finally:
+            cache.close()
+        
+        if run.stop_event.is_set():
+            run.mark_stopped()
             return
         
         if not metadata:
             raise Exception("No files found to extract")
         
-        if stop_event.is_set():
-            with extraction_lock:
-                extraction_state['status'] = 'stopped'
-                extraction_state['message'] = 'Extraction stopped by user'
+        if run.stop_event.is_set():
+            run.mark_stopped()
             return
         
         with extraction_lock:
-            extraction_state['total'] = len(metadata)
-            extraction_state['progress'] = len(metadata)
-            extraction_state['current_phase'] = 'Exporting results...'
-            extraction_state['message'] = f'Exporting {len(metadata)} files...'
+            run.set_counts(len(metadata), len(metadata))
+            state['current_phase'] = 'Exporting results...'
+            state['message'] = f'Exporting {len(metadata)} files...'
         
         output_dir = Path('output')
         output_dir.mkdir(exist_ok=True)
         output_path = output_dir / Path(output_name).name
         
-        if stop_event.is_set():
-            with extraction_lock:
-                extraction_state['status'] = 'stopped'
-                extraction_state['message'] = 'Extraction stopped by user'
-            return
-        
-        if 'csv' in export_formats:
-            csv_exporter = CSVExporter(str(output_path))
-            csv_exporter.export(metadata)
-        
-        if stop_event.is_set():
-            with extraction_lock:
-                extraction_state['status'] = 'stopped'
-                extraction_state['message'] = 'Extraction stopped by user'
+        if run.stop_event.is_set():
+            run.mark_stopped()
             return
         
-        if 'json' in export_formats:
-            json_exporter = JSONExporter(str(output_path))
-            json_exporter.export(metadata)
+        if 'pdf' in export_formats and len(metadata) > PDF_MAX_ROWS:
+            print(f"⚠ Skipping PDF report ({len(metadata)} files, limit {PDF_MAX_ROWS})")
+            export_formats = [fmt for fmt in export_formats if fmt != 'pdf']
         
-        if stop_event.is_set():
-            with extraction_lock:
-                extraction_state['status'] = 'stopped'
-                extraction_state['message'] = 'Extraction stopped by user'
-            return
+        digest = ForensicDigest(metadata)
         
-        if 'pdf' in export_formats:
-            pdf_exporter = PDFExporter(str(output_path))
-            pdf_exporter.export(metadata)
+        exporter_classes = {'csv': CSVExporter, 'json': JSONExporter, 'pdf': PDFExporter}
+        exporters = [exporter_classes[fmt](str(output_path)) for fmt in export_formats]
+        with ThreadPoolExecutor(max_workers=len(exporters)) as executor:
+            futures = [executor.submit(exporter.export, metadata, digest) for exporter in exporters]
+            for future in futures:
+                future.result()
         
-        if stop_event.is_set():
-            with extraction_lock:
-                extraction_state['status'] = 'stopped'
-                extraction_state['message'] = 'Extraction stopped by user'
+        if run.stop_event.is_set():
+            run.mark_stopped()
             return
         
         with extraction_lock:
-            extraction_state['status'] = 'completed'
-            extraction_state['metadata'] = metadata
-            extraction_state['output_path'] = f"output/{output_path.name}"
-            extraction_state['message'] = f'Successfully extracted {len(metadata)} files!'
-            extraction_state['elapsed_time'] = time.time() - extraction_state['start_time']
+            state['status'] = 'completed'
+            state['output_path'] = f"output/{output_path.name}"
+            state['message'] = f'Successfully extracted {len(metadata)} files!'
+            state['elapsed_time'] = run.elapsed_seconds()
         
     except Exception as e:
-        if not stop_event.is_set():
+        if isinstance(e, HttpError) and e.resp.status == 401:
+            invalidate_service()
+        if not run.stop_event.is_set():
             with extraction_lock:
-                extraction_state['status'] = 'error'
-                extraction_state['error'] = str(e)
-                extraction_state['message'] = f'Error: {str(e)}'
+                state['status'] = 'error'
+                if state['start_time']:
+                    state['elapsed_time'] = run.elapsed_seconds()
+                state['error'] = str(e)
+                state['message'] = f'Error: {str(e)}'
+
+
+def extraction_worker():
+    """Runs queued extractions one after another on a single long-lived thread"""
+    while True:
+        run_extraction(*extraction_queue.get())
+
+
+def submit_extraction(*args):
+    """
+    Queues run_extraction(run, *args) for the extraction thread as a new
+    current run, starting the thread on first use. The run is 'queued' until
+    the previous one, if it is still winding down, has returned. Must be
+    called with extraction_lock held.
+    
+    Returns:
+        ExtractionRun: The submitted run
+    """
+    global current_run, extraction_thread
+    
+    run = current_run = ExtractionRun(new_extraction_state('queued', 'Waiting to start...'))
+    if extraction_thread is None:
+        extraction_thread = threading.Thread(target=extraction_worker, name='extraction', daemon=True)
+        extraction_thread.start()
+    extraction_queue.put((run,) + args)
+    return run
+
+
+INLINE_BLOCK_RE = re.compile(r'(<(style|script)>)(.*?)(</\2>)', re.S)
+
+
+def minify_page(html):
+    """
+    Minifies the inline <style> and <script> blocks of a page when rcssmin
+    and rjsmin are installed; otherwise returns the page unchanged.
+    
+    Args:
+        html: Rendered HTML page
+    
+    Returns:
+        str: The page with minified CSS and JavaScript
+    """
+    if rcssmin is None:
+        return html
+    
+    def minify(match):
+        minifier = rcssmin.cssmin if match.group(2) == 'style' else rjsmin.jsmin
+        return match.group(1) + minifier(match.group(3)) + match.group(4)
+    
+    return INLINE_BLOCK_RE.sub(minify, html)
+
+
+with app.app_context():
+    MAIN_PAGE = minify_page(render_template_string(MAIN_TEMPLATE)).encode('utf-8')
+MAIN_PAGE_ETAG = hashlib.sha256(MAIN_PAGE).hexdigest()
+MAIN_PAGE_ENCODED = [('gzip', gzip.compress(MAIN_PAGE, compresslevel=9))]
+if brotli is not None:
+    MAIN_PAGE_ENCODED.insert(0, ('br', brotli.compress(MAIN_PAGE, quality=11)))
+
+# Compiled once; render_template_string would recompile it on every request
+VIEWER_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
 
 
 @app.route('/')
 def index():
-    """Main page"""
-    return render_template_string(MAIN_TEMPLATE)
+    """Main page (static, rendered and compressed once at startup)"""
+    if request.if_none_match.contains_weak(MAIN_PAGE_ETAG):
+        response = Response(status=304)
+    else:
+        response = Response(MAIN_PAGE, mimetype='text/html')
+        for encoding, body in MAIN_PAGE_ENCODED:
+            if request.accept_encodings.quality(encoding) > 0:
+                response = Response(body, mimetype='text/html')
+                response.headers['Content-Encoding'] = encoding
+                break
+    response.set_etag(MAIN_PAGE_ETAG, weak=True)
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 @app.route('/api/start-extraction', methods=['POST'])
 def start_extraction():
     """Start extraction"""
-    global extraction_state, stop_event, pause_event
-    
     with extraction_lock:
-        if extraction_state['status'] == 'running':
+        if current_run.state['status'] in ACTIVE_STATUSES:
             return jsonify({'error': 'Extraction already running'}), 400
         
         data = request.json
@@ -885,59 +1117,89 @@ def start_extraction():
                 return jsonify({'error': 'Invalid folder ID or shared link format. Please provide a valid Google Drive folder ID or shared link.'}), 400
         
         output_name = data.get('output_name', 'forensic_metadata')
-        workers = data.get('workers')
+        workers = data.get('workers', 1)
         include_trashed = data.get('include_trashed', False)
         
         export_formats = ['csv', 'json', 'pdf']
         
-        stop_event.clear()
-        pause_event.clear()
-        
-        extraction_state = {
-            'status': 'idle',
-            'progress': 0,
-            'total': 0,
-            'current_phase': '',
-            'message': '',
-            'metadata': None,
-            'output_path': None,
-            'error': None,
-            'start_time': None,
-            'elapsed_time': 0
-        }
-        
-        thread = threading.Thread(
-            target=run_extraction,
-            args=(folder_id, output_name, workers, include_trashed, export_formats),
-            daemon=True
-        )
-        thread.start()
+        submit_extraction(folder_id, output_name, workers, include_trashed, export_formats)
         
         return jsonify({'status': 'started'})
 
 
 @app.route('/api/progress')
 def get_progress():
-    """Get extraction progress"""
-    global extraction_state
-    
+    """Get extraction progress (the extracted metadata is served by /viewer)"""
     with extraction_lock:
-        if extraction_state['start_time']:
-            extraction_state['elapsed_time'] = time.time() - extraction_state['start_time']
+        snapshot = progress_snapshot()
+    
+    return jsonify(snapshot)
+
+
+PROGRESS_TICK = 1.0
+# Each open progress stream holds a server thread for the whole extraction
+SERVER_THREADS = 8
+FINISHED_STATUSES = ('completed', 'error', 'stopped')
+
+
+def progress_snapshot():
+    """
+    Copies the current run's state together with its progress counters.
+    Must be called with extraction_lock held.
+    
+    Returns:
+        dict: Run state with the current progress, total and elapsed time
+    """
+    run = current_run
+    snapshot = dict(run.state)
+    snapshot['progress'] = run.progress.value
+    snapshot['total'] = run.total.value
+    if snapshot['start_time'] and snapshot['status'] in ('running', 'paused'):
+        snapshot['elapsed_time'] = run.elapsed_seconds()
+    return snapshot
+
+
+@app.route('/api/events')
+def progress_events():
+    """
+    Streams extraction progress as Server-Sent Events. An event is pushed
+    whenever the extraction state changes, and at least every PROGRESS_TICK
+    seconds while the elapsed time is running. The stream ends once the
+    extraction finishes.
+    """
+    def stream():
+        last_payload = None
+        while True:
+            # acquire/release rather than "with", so waiting streams do not wake each other
+            extraction_lock.acquire()
+            try:
+                if last_payload is not None:
+                    extraction_lock.wait(timeout=PROGRESS_TICK)
+                snapshot = progress_snapshot()
+            finally:
+                extraction_lock.release()
+            
+            payload = app.json.dumps(snapshot)
+            if payload != last_payload:
+                last_payload = payload
+                yield f'data: {payload}\n\n'
+            else:
+                yield ': keepalive\n\n'
+            
+            if snapshot['status'] in FINISHED_STATUSES:
+                return
     
-    return jsonify(extraction_state)
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
 
 
 @app.route('/api/pause-extraction', methods=['POST'])
 def pause_extraction():
     """Pause the extraction"""
-    global extraction_state, pause_event
-    
     with extraction_lock:
-        if extraction_state['status'] == 'running':
-            pause_event.set()
-            extraction_state['status'] = 'paused'
-            extraction_state['message'] = 'Extraction paused. Click Resume to continue.'
+        if current_run.state['status'] == 'running':
+            current_run.set_paused(True)
+            current_run.state['status'] = 'paused'
+            current_run.state['message'] = 'Extraction paused. Click Resume to continue.'
             return jsonify({'status': 'paused'})
         else:
             return jsonify({'error': 'Extraction is not running'}), 400
@@ -946,13 +1208,11 @@ def pause_extraction():
 @app.route('/api/resume-extraction', methods=['POST'])
 def resume_extraction():
     """Resume the extraction"""
-    global extraction_state, pause_event
-    
     with extraction_lock:
-        if extraction_state['status'] == 'paused':
-            pause_event.clear()
-            extraction_state['status'] = 'running'
-            extraction_state['message'] = 'Resuming extraction...'
+        if current_run.state['status'] == 'paused':
+            current_run.set_paused(False)
+            current_run.state['status'] = 'running'
+            current_run.state['message'] = 'Resuming extraction...'
             return jsonify({'status': 'resumed'})
         else:
             return jsonify({'error': 'Extraction is not paused'}), 400
@@ -961,25 +1221,14 @@ def resume_extraction():
 @app.route('/api/stop-extraction', methods=['POST'])
 def stop_extraction():
     """Stop the extraction"""
-    global extraction_state, stop_event, pause_event
+    global current_run
     
     with extraction_lock:
-        if extraction_state['status'] in ['running', 'paused']:
-            stop_event.set()
-            pause_event.clear()
-            
-            extraction_state = {
-                'status': 'idle',
-                'progress': 0,
-                'total': 0,
-                'current_phase': '',
-                'message': 'Extraction stopped by user',
-                'metadata': None,
-                'output_path': None,
-                'error': None,
-                'start_time': None,
-                'elapsed_time': 0
-            }
+        if current_run.state['status'] in ACTIVE_STATUSES:
+            current_run.stop()
+            load_export.cache_clear()
+            # The stopped run keeps writing to its own state while it winds down
+            current_run = ExtractionRun(new_extraction_state(message='Extraction stopped by user'))
             
             return jsonify({'status': 'stopped'})
         else:
@@ -989,85 +1238,129 @@ def stop_extraction():
 @app.route('/api/download/<format>')
 def download_file(format):
     """Download exported file"""
-    global extraction_state
-    
     with extraction_lock:
-        if not extraction_state['output_path']:
+        if not current_run.state['output_path']:
             return jsonify({'error': 'No file available'}), 404
         
         output_dir = Path('output')
-        output_path_str = extraction_state['output_path']
+        output_path_str = current_run.state['output_path']
         
         if output_path_str.startswith('output/'):
             file_path = Path(output_path_str).with_suffix(f'.{format}')
         else:
             file_path = output_dir / Path(output_path_str).with_suffix(f'.{format}').name
-        
-        if not file_path.exists():
-            return jsonify({'error': f'File not found: {file_path}'}), 404
-        
-        return send_file(str(file_path), as_attachment=True)
+    
+    if not file_path.exists():
+        return jsonify({'error': f'File not found: {file_path}'}), 404
+    
+    return send_file(str(file_path), as_attachment=True, conditional=True, etag=True, max_age=0)
+
+
+@lru_cache(maxsize=1)
+def load_export(path_str, mtime_ns, size):
+    """
+    Parses a JSON export for the results viewer. The result is cached, keyed
+    by the file's modification time and size, so reloading the viewer does
+    not parse the export again until a new extraction rewrites it.
+    
+    Args:
+        path_str: Path of the JSON export
+        mtime_ns: Modification time of the file in nanoseconds (cache key)
+        size: Size of the file in bytes (cache key)
+    
+    Returns:
+        Tuple of (files list or None, forensic hash or None, extraction date string or None)
+    """
+    with open(path_str, 'rb') as f:
+        raw = f.read()
+    json_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    
+    files = json_data.get('files')
+    file_hash = None
+    extraction_date = None
+    
+    header = json_data.get('extraction_metadata')
+    if header:
+        file_hash = header.get('file_hash_sha256') or header.get('forensic_integrity_hash_sha256')
+        if 'date' in header:
+            extraction_date = format_export_date(header['date'])
+    
+    return files, file_hash, extraction_date
+
+
+def format_export_date(date_str):
+    """Formats the ISO date of an export header for display"""
+    try:
+        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        return dt.strftime('%Y-%m-%d %H:%M:%S')
+    except:
+        return date_str[:19] if len(date_str) > 19 else date_str
+
+
+@lru_cache(maxsize=4)
+def hash_export(path_str, mtime_ns, size):
+    """
+    Returns the SHA-256 of an export file, cached by its modification time
+    and size so an unchanged file is never hashed twice.
+    
+    Args:
+        path_str: Path of the export file
+        mtime_ns: Modification time of the file in nanoseconds (cache key)
+        size: Size of the file in bytes (cache key)
+    
+    Returns:
+        SHA-256 hash as hexadecimal string
+    """
+    return calculate_file_hash(Path(path_str))
 
 
 @app.route('/viewer')
 def viewer():
     """Results viewer page - redirects to main viewer"""
-    global extraction_state
-    
     with extraction_lock:
-        if not extraction_state['metadata']:
-            return "No results available. Please run an extraction first.", 404
-        
-        
-        output_dir = Path('output')
-        output_path_str = extraction_state['output_path']
-        
-        if output_path_str.startswith('output/'):
-            json_file = Path(output_path_str).with_suffix('.json')
-        else:
-            json_file = output_dir / Path(output_path_str).with_suffix('.json').name
-        
-        file_hash = "N/A"
-        extraction_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        metadata_to_display = extraction_state.get('metadata', [])
-        
-        if json_file.exists():
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
-                    
-                    if 'files' in json_data:
-                        metadata_to_display = json_data['files']
-                    
-                    if 'extraction_metadata' in json_data:
-                        if 'file_hash_sha256' in json_data['extraction_metadata']:
-                            file_hash = json_data['extraction_metadata']['file_hash_sha256']
-                        elif 'forensic_integrity_hash_sha256' in json_data['extraction_metadata']:
-                            file_hash = json_data['extraction_metadata']['forensic_integrity_hash_sha256']
-                        
-                        if 'date' in json_data['extraction_metadata']:
-                            date_str = json_data['extraction_metadata']['date']
-                            try:
-                                dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                                extraction_date = dt.strftime('%Y-%m-%d %H:%M:%S')
-                            except:
-                                extraction_date = date_str[:19] if len(date_str) > 19 else date_str
-            except Exception as e:
-                print(f"Warning: Could not read JSON file: {e}")
-                if json_file.exists():
-                    file_hash = calculate_file_hash(json_file)
-        
-        if not metadata_to_display:
-            metadata_to_display = []
-        
-        return render_template_string(
-            HTML_TEMPLATE,
-            data=metadata_to_display,
-            total_files=len(metadata_to_display),
-            extraction_date=extraction_date,
-            file_hash=file_hash
-        )
+        output_path_str = current_run.state['output_path']
+    
+    if not output_path_str:
+        return "No results available. Please run an extraction first.", 404
+    
+    output_dir = Path('output')
+    
+    if output_path_str.startswith('output/'):
+        json_file = Path(output_path_str).with_suffix('.json')
+    else:
+        json_file = output_dir / Path(output_path_str).with_suffix('.json').name
+    
+    file_hash = "N/A"
+    extraction_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    metadata_to_display = []
+    
+    try:
+        stat = json_file.stat()
+    except OSError:
+        stat = None
+    
+    if stat is not None:
+        try:
+            files, export_hash, export_date = load_export(str(json_file), stat.st_mtime_ns, stat.st_size)
+            if files is not None:
+                metadata_to_display = files
+            file_hash = export_hash or file_hash
+            extraction_date = export_date or extraction_date
+        except Exception as e:
+            print(f"Warning: Could not read JSON file: {e}")
+            file_hash = hash_export(str(json_file), stat.st_mtime_ns, stat.st_size)
+    
+    facets = collect_facets(metadata_to_display)
+    return render_template(
+        VIEWER_TEMPLATE,
+        data=viewer_rows(metadata_to_display),
+        total_files=len(metadata_to_display),
+        extraction_date=extraction_date,
+        file_hash=file_hash,
+        types=facets['file_type'],
+        owners=facets['owner_email']
+    )
 
 
 if __name__ == '__main__':
@@ -1078,10 +1371,5 @@ if __name__ == '__main__':
     print(f"\nServer starting on http://localhost:{port}")
     print("Opening browser automatically...\n")
     
-    def open_browser():
-        time.sleep(1.5)
-        webbrowser.open(f'http://localhost:{port}')
-    
-    threading.Thread(target=open_browser, daemon=True).start()
-    
-    app.run(host='127.0.0.1', port=port, debug=False, use_reloader=False)
+    prewarm_connections()
+    serve(app, port, threads=SERVER_THREADS)